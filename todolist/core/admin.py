@@ -1,10 +1,51 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from django.utils.html import format_html
+from . import bulk
 from .models import Todo, Tag
+from .search import search_todos
+
+
+class CappedCountPaginator(Paginator):
+    """
+    Paginator that stops counting after ``max_count`` rows.
+
+    A full COUNT(*) over a large table costs more than the page itself;
+    beyond the cap the changelist offers ``max_count`` results' worth of
+    pages, and narrowing with filters or search reaches the rest.
+    """
+
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        return self.object_list.order_by().values("pk")[: self.max_count].count()
+
+
+class TodoActionForm(ActionForm):
+    tag = forms.CharField(
+        required=False,
+        max_length=Tag._meta.get_field("name").max_length,
+        help_text="Tag name for the add/remove tag actions",
+    )
 
 
 @admin.register(Todo)
 class TodoAdmin(admin.ModelAdmin):
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+    action_form = TodoActionForm
+    actions = [
+        "mark_completed",
+        "mark_cancelled",
+        "mark_open",
+        "add_tag",
+        "remove_tag",
+    ]
 
     list_display = (
         "title",
@@ -46,6 +87,18 @@ class TodoAdmin(admin.ModelAdmin):
 
     readonly_fields = ("created_at",)
 
+    def get_queryset(self, request):
+        # display_tags reads obj.tags for every row on the changelist
+        return super().get_queryset(request).prefetch_related("tags")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the full-text index instead of LIKE '%term%' scans. The
+        # changelist applies its own ordering, so skip ranking and keep the
+        # queryset safe to reuse as a subquery in bulk actions
+        if not search_term:
+            return queryset, False
+        return search_todos(queryset, search_term, ranked=False), False
+
     def display_tags(self, obj):
         return ", ".join([tag.name for tag in obj.tags.all()]) or "No tags"
 
@@ -67,6 +120,60 @@ class TodoAdmin(admin.ModelAdmin):
 
     status_color.short_description = "Status"
 
+    # Bulk actions run as a few set-based statements (see core.bulk) rather
+    # than saving each selected todo through save_model
+    def _set_status(self, request, queryset, status):
+        updated = bulk.set_status(queryset, status)
+        self.message_user(request, f"{updated} todo(s) marked as {status}.")
+
+    @admin.action(
+        description="Mark selected todos as completed", permissions=["change"]
+    )
+    def mark_completed(self, request, queryset):
+        self._set_status(request, queryset, "COMPLETED")
+
+    @admin.action(
+        description="Mark selected todos as cancelled", permissions=["change"]
+    )
+    def mark_cancelled(self, request, queryset):
+        self._set_status(request, queryset, "CANCELLED")
+
+    @admin.action(
+        description="Reopen selected todos (skips past-due ones)",
+        permissions=["change"],
+    )
+    def mark_open(self, request, queryset):
+        self._set_status(request, queryset, "OPEN")
+
+    def _change_tag(self, request, queryset, operation, message):
+        name = request.POST.get("tag", "")
+        try:
+            changed = operation(queryset, name)
+        except ValidationError as exc:
+            self.message_user(request, exc.messages[0], messages.ERROR)
+            return
+        self.message_user(request, message.format(name=name.strip().lower(), n=changed))
+
+    @admin.action(description="Add tag to selected todos", permissions=["change"])
+    def add_tag(self, request, queryset):
+        self._change_tag(
+            request,
+            queryset,
+            bulk.add_tag,
+            'Tag "{name}" added to {n} todo(s); todos that already had it or '
+            "already have the maximum number of tags were skipped.",
+        )
+
+    @admin.action(description="Remove tag from selected todos", permissions=["change"])
+    def remove_tag(self, request, queryset):
+        self._change_tag(
+            request, queryset, bulk.remove_tag, 'Tag "{name}" removed from {n} todo(s).'
+        )
+
+    def delete_queryset(self, request, queryset):
+        # Used by the "delete selected" action once it has been confirmed
+        bulk.delete_todos(queryset)
+
     # Custom validation in admin
     def save_model(self, request, obj, form, change):
 
@@ -84,12 +191,15 @@ class TodoAdmin(admin.ModelAdmin):
 class TagAdmin(admin.ModelAdmin):
     list_display = ("name", "todo_count")
     search_fields = ["name"]
+    paginator = CappedCountPaginator
+    show_full_result_count = False
 
     def todo_count(self, obj):
-        count = obj.todos.count()
-        return str(count)  # Explicitly convert to string
+        # Stored on the tag, so the changelist needs no per-row COUNT
+        return str(obj.num_todos)  # Explicitly convert to string
 
     todo_count.short_description = "Number of Todos"
+    todo_count.admin_order_field = "num_todos"
 
 
 admin.site.site_header = "AlgoBulls Todo Management"
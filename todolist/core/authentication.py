@@ -0,0 +1,38 @@
+from django.conf import settings
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .cache import LocalCache
+
+token_cache = LocalCache(
+    ttl=getattr(settings, "TOKEN_AUTH_CACHE_TTL", 300),
+    max_entries=getattr(settings, "TOKEN_AUTH_CACHE_MAX_ENTRIES", 10000),
+)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that remembers token -> user lookups in process.
+
+    Unlike BasicAuthentication no password hashing is done; a cache hit costs
+    no queries and a miss costs a single joined query. Saving a user or
+    deleting a token evicts the cached entries in this process; other
+    processes notice within TOKEN_AUTH_CACHE_TTL.
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is not None:
+            return (token.user, token)
+
+        model = self.get_model()
+        try:
+            token = model.objects.select_related("user").get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed("Invalid token.")
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed("User inactive or deleted.")
+
+        token_cache.set(key, token)
+        return (token.user, token)
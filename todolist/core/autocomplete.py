@@ -0,0 +1,88 @@
+import heapq
+import sys
+from bisect import bisect_left
+from itertools import islice
+
+from django.db.models.functions import Lower
+
+from .cache import tag_cache
+from .models import Tag
+
+# Users with more tags than this are served from the index on every request
+# instead of from the in-process list
+MAX_CACHED_TAGS = 5000
+
+
+def _prefix_end(prefix):
+    """
+    Return the smallest string above every string starting with ``prefix``,
+    or None when there is none (the prefix is all U+10FFFF).
+    """
+    stem = prefix.rstrip(chr(sys.maxunicode))
+    if not stem:
+        return None
+    return stem[:-1] + chr(ord(stem[-1]) + 1)
+
+
+def _tags(user, prefix=""):
+    queryset = Tag.objects.annotate(lower_name=Lower("name")).filter(user=user)
+    if prefix:
+        # A range on lower(name) lets the (user, lower(name)) index seek
+        # straight to the prefix; LIKE 'x%' would scan
+        queryset = queryset.filter(lower_name__gte=prefix)
+        upper = _prefix_end(prefix)
+        if upper is not None:
+            queryset = queryset.filter(lower_name__lt=upper)
+    return queryset
+
+
+def load_tags(user):
+    """
+    Return the user's tags as (lower name, id, name, todo count) tuples
+    sorted by name, or None when there are too many to keep in memory.
+    """
+    rows = list(
+        _tags(user)
+        .order_by("lower_name")
+        .values_list("lower_name", "id", "name", "num_todos")[: MAX_CACHED_TAGS + 1]
+    )
+    return rows if len(rows) <= MAX_CACHED_TAGS else None
+
+
+def suggest_tags(user, prefix="", limit=10):
+    """
+    Return up to ``limit`` of the user's tags starting with ``prefix``
+    (case-insensitive), most used first.
+
+    Usage counts in the cached list may lag by up to the cache TTL; new,
+    renamed and deleted tags are evicted straight away.
+    """
+    prefix = prefix.strip().lower()
+
+    tags = tag_cache.get(user.pk)
+    if tags is None:
+        tags = load_tags(user)
+        if tags is None:
+            # False remembers "too many", so large tag sets skip the load
+            tags = False
+        tag_cache.set(user.pk, tags)
+
+    if tags is False:
+        rows = (
+            _tags(user, prefix)
+            .order_by("-num_todos", "lower_name")
+            .values_list("id", "name", "num_todos")[:limit]
+        )
+    else:
+        start = bisect_left(tags, (prefix,))
+        matches = []
+        for entry in islice(tags, start, None):
+            if not entry[0].startswith(prefix):
+                break
+            matches.append(entry)
+        rows = [
+            entry[1:]
+            for entry in heapq.nsmallest(limit, matches, key=lambda e: (-e[3], e[0]))
+        ]
+
+    return [{"id": pk, "name": name, "count": count} for pk, name, count in rows]
@@ -0,0 +1,192 @@
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from rest_framework import status
+
+from .models import Tag, Todo
+from .serializers import TagSerializer, TodoSerializer
+
+
+class OperationFailed(Exception):
+    """
+    Raised when one batch operation cannot be applied; carries the HTTP
+    status and error body reported for that operation.
+    """
+
+    def __init__(self, status_code, errors):
+        super().__init__(errors)
+        self.status_code = status_code
+        self.errors = errors
+
+    def result(self):
+        return {"status": self.status_code, "errors": self.errors}
+
+
+class RollBack(Exception):
+    # Unwinds the outer transaction when an atomic batch hits a failure
+    def __init__(self, index, failure):
+        super().__init__(index)
+        self.index = index
+        self.failure = failure
+
+
+NOT_FOUND = {"detail": "Not found."}
+
+
+def _load(queryset, user, operations, type_):
+    # Every todo (or tag) the batch refers to, in one query
+    ids = {op["id"] for op in operations if op["type"] == type_ and "id" in op}
+    if not ids:
+        return {}
+    return {obj.pk: obj for obj in queryset.filter(user=user, pk__in=ids)}
+
+
+class Batch:
+    """
+    Runs a list of validated batch operations for one user, in order.
+
+    Every operation's input is checked up front with the serializer the
+    regular endpoints use, and the tag names of all todo operations are
+    resolved with a single lookup before anything is written.
+    """
+
+    def __init__(self, request, operations, mode="atomic"):
+        self.request = request
+        self.user = request.user
+        self.operations = operations
+        self.atomic = mode == "atomic"
+        self.context = {"request": request}
+        self.todos = _load(
+            Todo.objects.prefetch_related("tags"), self.user, operations, "todo"
+        )
+        self.tags = _load(Tag.objects.all(), self.user, operations, "tag")
+
+    def _instance(self, objects, pk):
+        instance = objects.get(pk)
+        if instance is None:
+            raise OperationFailed(status.HTTP_404_NOT_FOUND, NOT_FOUND)
+        return instance
+
+    def prepare(self, op):
+        """
+        Validate one operation and return what execute() needs to apply it.
+        """
+        objects = self.todos if op["type"] == "todo" else self.tags
+        instance = None
+        if op["op"] != "create":
+            instance = self._instance(objects, op["id"])
+        if op["op"] == "delete":
+            return instance
+
+        if op["type"] == "todo":
+            serializer = TodoSerializer(
+                instance,
+                data=op["data"],
+                partial=instance is not None,
+                context=self.context,
+            )
+        else:
+            serializer = TagSerializer(
+                instance, data=op["data"], partial=instance is not None
+            )
+        if not serializer.is_valid():
+            raise OperationFailed(status.HTTP_400_BAD_REQUEST, serializer.errors)
+        return serializer
+
+    def resolve_tags(self, prepared):
+        names = set()
+        for op, item in zip(self.operations, prepared):
+            if op["type"] == "todo" and op["op"] != "delete":
+                if not isinstance(item, OperationFailed):
+                    tags = item.validated_data.get("tags") or []
+                    names.update(tag["name"] for tag in tags)
+        self.context["resolved_tags"] = Tag.resolve_names(self.user, names)
+
+    def execute(self, op, item):
+        """
+        Apply one prepared operation and return its result entry.
+        """
+        if op["type"] == "tag":
+            # Created, renamed or deleted tags make the resolved names stale,
+            # so later todo operations resolve their own
+            self.context.pop("resolved_tags", None)
+            if op["op"] != "create":
+                # ...and the loaded todos' prefetched tags, so their results
+                # show the rename or deletion
+                for todo in self.todos.values():
+                    todo._prefetched_objects_cache.pop("tags", None)
+
+        instance = item if op["op"] == "delete" else item.instance
+        if instance is not None and instance.pk is None:
+            # An earlier operation in the batch deleted it
+            raise OperationFailed(status.HTTP_404_NOT_FOUND, NOT_FOUND)
+
+        if op["op"] == "delete":
+            instance.delete()
+            return {"status": status.HTTP_204_NO_CONTENT}
+
+        try:
+            item.save(user=self.user)
+        except ValidationError as exc:
+            raise OperationFailed(
+                status.HTTP_400_BAD_REQUEST,
+                exc.message_dict if hasattr(exc, "error_dict") else exc.messages,
+            )
+        except IntegrityError:
+            raise OperationFailed(
+                status.HTTP_400_BAD_REQUEST,
+                {"name": ["A tag with this name already exists."]},
+            )
+
+        created = op["op"] == "create"
+        return {
+            "status": status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+            "data": item.data,
+        }
+
+    def run(self):
+        """
+        Return (ok, results) with one result entry per operation. In atomic
+        mode ok is False and nothing is written if any operation failed.
+        """
+        prepared = []
+        for op in self.operations:
+            try:
+                prepared.append(self.prepare(op))
+            except OperationFailed as exc:
+                prepared.append(exc)
+
+        if self.atomic:
+            for index, item in enumerate(prepared):
+                if isinstance(item, OperationFailed):
+                    return False, self.rolled_back(index, item)
+
+        results = []
+        try:
+            with transaction.atomic():
+                self.resolve_tags(prepared)
+                for index, (op, item) in enumerate(zip(self.operations, prepared)):
+                    if isinstance(item, OperationFailed):
+                        results.append(item.result())
+                        continue
+                    try:
+                        # Each operation gets a savepoint so a failed one
+                        # leaves the rest of the transaction usable
+                        with transaction.atomic():
+                            results.append(self.execute(op, item))
+                    except OperationFailed as exc:
+                        if self.atomic:
+                            raise RollBack(index, exc)
+                        results.append(exc.result())
+        except RollBack as exc:
+            return False, self.rolled_back(exc.index, exc.failure)
+        return all(200 <= r["status"] < 300 for r in results), results
+
+    def rolled_back(self, index, failure):
+        skipped = {
+            "status": status.HTTP_424_FAILED_DEPENDENCY,
+            "errors": {"detail": f"Not applied: operation {index} failed."},
+        }
+        return [
+            failure.result() if i == index else skipped
+            for i in range(len(self.operations))
+        ]
@@ -0,0 +1,231 @@
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .cache import bump_todo_version, tag_cache
+from .models import Tag, Todo, TodoStatusCount, Tombstone
+from .serializers import MAX_TAGS
+
+TAG_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+
+def _todos(queryset):
+    # Re-select by primary key so the statements below do not inherit the
+    # caller's joins, ordering or prefetches (e.g. from admin search)
+    return Todo.objects.filter(pk__in=queryset.order_by().values("pk"))
+
+
+def _clean_tag_name(name):
+    name = (name or "").strip().lower()
+    if not 0 < len(name) <= TAG_MAX_LENGTH:
+        raise ValidationError(f"Tag names must be 1 to {TAG_MAX_LENGTH} characters.")
+    return name
+
+
+def _touch(todo_ids, user_ids):
+    # Set-based writes send no signals, so do what the signal handlers
+    # would: mark the todos changed for delta sync and drop cached lists
+    if todo_ids:
+        Todo.objects.filter(pk__in=todo_ids).update(updated_at=timezone.now())
+    bump_todo_version(*user_ids)
+
+
+def set_status(queryset, status):
+    """
+    Set ``status`` on every todo in ``queryset`` with a single UPDATE and
+    return how many changed.
+
+    Reopening skips todos whose due date has passed, which Todo.clean would
+    reject on save.
+    """
+    now = timezone.now()
+    todos = _todos(queryset).exclude(status=status)
+    if status == "OPEN":
+        todos = todos.exclude(due_date__lt=now)
+
+    with transaction.atomic():
+        moved = list(
+            todos.order_by()
+            .values_list("user_id", "status")
+            .annotate(total=Count("id"))
+        )
+        updated = todos.update(status=status, updated_at=now)
+        deltas = Counter()
+        for user_id, old_status, total in moved:
+            deltas[user_id, old_status] -= total
+            deltas[user_id, status] += total
+        TodoStatusCount.adjust(deltas)
+        _touch([], [user_id for user_id, _, _ in moved])
+    return updated
+
+
+def add_tag(queryset, name):
+    """
+    Tag every todo in ``queryset`` with ``name``, creating the tag for each
+    owner as needed, and return how many todos gained it.
+
+    Todos that already have the tag or already carry MAX_TAGS tags are left
+    alone.
+    """
+    name = _clean_tag_name(name)
+    todos = (
+        _todos(queryset)
+        .exclude(tags__name=name)
+        .annotate(tag_total=Count("tags"))
+        .filter(tag_total__lt=MAX_TAGS)
+    )
+
+    with transaction.atomic():
+        rows = list(todos.values_list("id", "user_id"))
+        if not rows:
+            return 0
+
+        # Every owner's tag in one lookup, then the missing ones in one insert
+        user_ids = {user_id for _, user_id in rows}
+        tags = {
+            tag.user_id: tag
+            for tag in Tag.objects.annotate(lower_name=Lower("name")).filter(
+                user_id__in=user_ids, lower_name=name
+            )
+        }
+        missing = [
+            Tag(name=name, user_id=user_id) for user_id in sorted(user_ids - set(tags))
+        ]
+        if missing:
+            Tag.objects.bulk_create(missing)
+            for tag in missing:
+                # bulk_create sends no post_save, so evict the autocomplete list
+                tag_cache.delete(tag.user_id)
+                tags[tag.user_id] = tag
+        Todo.tags.through.objects.bulk_create(
+            Todo.tags.through(todo_id=pk, tag_id=tags[user_id].pk)
+            for pk, user_id in rows
+        )
+        Tag.adjust_todo_counts(Counter(tags[user_id].pk for _, user_id in rows))
+        _touch([pk for pk, _ in rows], user_ids)
+    return len(rows)
+
+
+def remove_tag(queryset, name):
+    """
+    Remove the tag ``name`` from every todo in ``queryset`` and return how
+    many todos lost it.
+    """
+    name = _clean_tag_name(name)
+    tag_ids = (
+        Tag.objects.annotate(lower_name=Lower("name"))
+        .filter(lower_name=name)
+        .values("id")
+    )
+    links = Todo.tags.through.objects.filter(
+        todo_id__in=_todos(queryset).values("pk"), tag_id__in=tag_ids
+    )
+
+    with transaction.atomic():
+        rows = list(links.values_list("todo_id", "todo__user_id", "tag_id"))
+        if not rows:
+            return 0
+        links.delete()
+        removed = Counter(tag_id for _, _, tag_id in rows)
+        Tag.adjust_todo_counts({tag_id: -n for tag_id, n in removed.items()})
+        _touch([pk for pk, _, _ in rows], [user_id for _, user_id, _ in rows])
+    return len(rows)
+
+
+def delete_todos(queryset):
+    """
+    Delete every todo in ``queryset`` with a constant number of statements
+    and return how many were deleted.
+
+    Tombstones for delta sync are written and tag and status counts updated
+    in one batch each, instead of by the per-object delete handlers.
+    """
+    todos = _todos(queryset)
+
+    with transaction.atomic():
+        rows = list(todos.values_list("id", "user_id", "status"))
+        if not rows:
+            return 0
+        Tombstone.objects.bulk_create(
+            Tombstone(user_id=user_id, kind="todo", object_id=pk)
+            for pk, user_id, _ in rows
+        )
+        links = Todo.tags.through.objects.filter(todo_id__in=todos.values("pk"))
+        tag_ids = list(links.values_list("tag_id", flat=True).distinct())
+        links.delete()
+        Tag.recount_todos(Tag.objects.filter(pk__in=tag_ids))
+        # QuerySet.delete() cannot be used: Todo has pre_delete/post_delete
+        # receivers (tombstones, counts, cache), so the collector would load
+        # every row, repeat per row what was just done in bulk above and
+        # delete in chunks of 100 ids. Nothing else references a todo, so
+        # issue the one DELETE directly
+        todos._raw_delete(todos.db)
+        deleted = Counter((user_id, status) for _, user_id, status in rows)
+        TodoStatusCount.adjust({key: -n for key, n in deleted.items()})
+        _touch([], [user_id for _, user_id, _ in rows])
+    return len(rows)
+
+
+def merge_tags(user, source_names, target_name):
+    """
+    Merge the user's tags named ``source_names`` into the tag named
+    ``target_name`` and return ``(target, todos_changed)``.
+
+    Through-rows are repointed with a constant number of statements in one
+    transaction. Links that would duplicate one the todo already has are
+    dropped, then the source tags are deleted. If no tag is called
+    ``target_name`` yet, one of the sources is renamed instead, which makes
+    a single-source merge a rename.
+    """
+    target_name = _clean_tag_name(target_name)
+    names = {_clean_tag_name(name) for name in source_names} - {target_name}
+    tags = Tag.objects.annotate(lower_name=Lower("name")).filter(user=user)
+
+    with transaction.atomic():
+        sources = {tag.lower_name: tag for tag in tags.filter(lower_name__in=names)}
+        unknown = names - set(sources)
+        if unknown:
+            raise ValidationError(f"Unknown tags: {', '.join(sorted(unknown))}.")
+
+        target = tags.filter(lower_name=target_name).first()
+        if target is None:
+            if not sources:
+                raise ValidationError(f"Unknown tags: {target_name}.")
+            target = sources.pop(sorted(sources)[0])
+            target.name = target_name
+            target.save()
+        if not sources:
+            return target, 0
+
+        source_ids = [tag.pk for tag in sources.values()]
+        through = Todo.tags.through.objects
+        links = through.filter(tag_id__in=source_ids)
+        changed = Todo.objects.filter(pk__in=links.values("todo_id")).update(
+            updated_at=timezone.now()
+        )
+
+        # Keep at most one link per todo: drop source links where the todo
+        # already has the target, or another source with a lower id
+        links.filter(
+            Exists(through.filter(todo_id=OuterRef("todo_id"), tag_id=target.pk))
+            | Exists(
+                through.filter(
+                    todo_id=OuterRef("todo_id"),
+                    tag_id__in=source_ids,
+                    tag_id__lt=OuterRef("tag_id"),
+                )
+            )
+        ).delete()
+        links.update(tag_id=target.pk)
+
+        # The sources have no links left; deleting them records tombstones
+        Tag.objects.filter(pk__in=source_ids).delete()
+        Tag.recount_todos(Tag.objects.filter(pk=target.pk))
+        bump_todo_version(user.pk)
+
+    target.refresh_from_db()
+    return target, changed
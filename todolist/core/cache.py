@@ -0,0 +1,138 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+
+
+class LocalCache:
+    """
+    Small thread-safe in-process cache bounded by a TTL and a maximum
+    number of entries.
+
+    Entries expire after ``ttl`` seconds, so changes made by another process
+    show up within that window; callers evict entries for changes made in
+    this process themselves.
+    """
+
+    def __init__(self, ttl, max_entries):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._purge()
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _purge(self):
+        # Drop expired entries first; if still full, evict the oldest ones
+        now = time.monotonic()
+        for key in [k for k, (_, exp) in self._entries.items() if exp <= now]:
+            del self._entries[key]
+        overflow = len(self._entries) - self.max_entries + 1
+        for key in list(self._entries)[: max(overflow, 0)]:
+            del self._entries[key]
+
+
+# Each user's tag list for autocomplete (see core.autocomplete); evicted when
+# the user's tags are created, renamed or deleted in this process
+tag_cache = LocalCache(
+    ttl=getattr(settings, "TAG_AUTOCOMPLETE_CACHE_TTL", 60),
+    max_entries=getattr(settings, "TAG_AUTOCOMPLETE_CACHE_MAX_ENTRIES", 1000),
+)
+
+
+def get_todo_version(user_id):
+    """
+    Return the current data version for a user's todos.
+    """
+    # Imported here because core.models imports this module
+    from .models import TodoVersion
+
+    return TodoVersion.current(user_id)
+
+
+def bump_todo_version(*user_ids):
+    """
+    Invalidate every cached todo response and ETag for the given users.
+
+    The version lives in the database and is bumped inside the caller's
+    transaction, so writes from any process (other web workers, management
+    commands) invalidate this process's cached lists once they commit.
+    """
+    from .models import TodoVersion
+
+    TodoVersion.bump(*user_ids)
+
+
+def _request_version(request):
+    # Read the version once per request, and before any todo data: a
+    # write committing in between then moves the version on past whatever
+    # this request caches
+    if not hasattr(request, "_todo_version"):
+        request._todo_version = get_todo_version(request.user.pk)
+    return request._todo_version
+
+
+def todo_list_cache_key(request):
+    """
+    Cache key for a list response, scoped to the user's current version and
+    the full request URL (query string included).
+    """
+    user_id = request.user.pk
+    url = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f"todos:list:{user_id}:{_request_version(request)}:{url}"
+
+
+def cache_todo_list(key, data):
+    cache.set(key, data, timeout=getattr(settings, "TODO_LIST_CACHE_TIMEOUT", 300))
+
+
+def todo_etag(request):
+    """
+    Strong ETag for a todo response, derived from the user's data version
+    so it costs one primary-key lookup instead of reading the todos.
+    """
+    raw = ":".join(
+        [
+            str(_request_version(request)),
+            request.build_absolute_uri(),
+            request.META.get("HTTP_ACCEPT", ""),
+        ]
+    )
+    return '"%s"' % hashlib.md5(raw.encode()).hexdigest()
+
+
+def etag_matches(request, etag, wildcard=True):
+    # If-None-Match uses weak comparison, so W/"x" matches "x". "*" matches
+    # any existing representation, so callers that have not yet checked the
+    # object exists pass wildcard=False
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return (wildcard and "*" in etags) or etag in etags or f"W/{etag}" in etags
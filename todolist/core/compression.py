@@ -0,0 +1,116 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional; br is only offered when installed
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional; zstd is only offered when installed
+    zstandard = None
+
+
+class Codec:
+    """
+    One Content-Encoding. ``factory(level)`` returns a
+    (compress, sync, finish) triple for a fresh compressor: compress(data)
+    feeds bytes, sync() flushes what was fed so far so the client can
+    decode it, and finish() ends the stream.
+    """
+
+    def __init__(self, name, default_level, factory):
+        self.name = name
+        self.default_level = default_level
+        self.factory = factory
+
+    def compress(self, data, level=None):
+        compress, _, finish = self.factory(level or self.default_level)
+        return compress(data) + finish()
+
+    def stream(self, chunks, level=None):
+        # Flush after every chunk so streamed responses stay incremental;
+        # callers should send chunks of a few hundred rows, not single lines
+        compress, sync, finish = self.factory(level or self.default_level)
+        for chunk in chunks:
+            data = compress(chunk) + sync()
+            if data:
+                yield data
+        yield finish()
+
+    async def astream(self, chunks, level=None):
+        compress, sync, finish = self.factory(level or self.default_level)
+        async for chunk in chunks:
+            data = compress(chunk) + sync()
+            if data:
+                yield data
+        yield finish()
+
+
+def _gzip(level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli(level):
+    compressor = brotli.Compressor(quality=level)
+    return compressor.process, compressor.flush, compressor.finish
+
+
+def _zstd(level):
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return (
+        compressor.compress,
+        lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush,
+    )
+
+
+# Installed codecs, most preferred first when the client rates them equally
+CODECS = {}
+if brotli is not None:
+    CODECS["br"] = Codec("br", 4, _brotli)
+if zstandard is not None:
+    CODECS["zstd"] = Codec("zstd", 3, _zstd)
+CODECS["gzip"] = Codec("gzip", 6, _gzip)
+
+
+def parse_accept_encoding(header):
+    """
+    Map each coding in an Accept-Encoding header to its q-value.
+    """
+    accepted = {}
+    for part in header.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def negotiate(header, codecs=None):
+    """
+    Return the Codec to encode a response with for the given
+    Accept-Encoding header, or None to send it unencoded.
+    """
+    codecs = CODECS if codecs is None else codecs
+    accepted = parse_accept_encoding(header or "")
+    best, best_quality = None, 0.0
+    for name, codec in codecs.items():
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
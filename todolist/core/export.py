@@ -0,0 +1,92 @@
+import csv
+import json
+
+from rest_framework import serializers
+
+from .models import Todo
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "created_at",
+    "updated_at",
+    "due_date",
+    "status",
+    "tags",
+]
+
+# Rows fetched (and tags prefetched) per database round trip
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows joined into one chunk of the streamed response body
+EXPORT_LINES_PER_CHUNK = 500
+
+
+def export_rows(user, chunk_size=None):
+    """
+    Yield a user's todos as plain dicts, newest first.
+
+    Rows are read with a server-side iterator and tags are prefetched one
+    chunk at a time, so memory stays flat however many todos there are.
+    """
+    queryset = (
+        Todo.objects.filter(user=user)
+        .order_by("-created_at", "-id")
+        .prefetch_related("tags")
+    )
+    # Format datetimes exactly as the API does
+    datetime_field = serializers.DateTimeField()
+
+    def format_datetime(value):
+        return datetime_field.to_representation(value) if value else None
+
+    for todo in queryset.iterator(chunk_size=chunk_size or EXPORT_CHUNK_SIZE):
+        yield {
+            "id": todo.id,
+            "title": todo.title,
+            "description": todo.description,
+            "created_at": format_datetime(todo.created_at),
+            "updated_at": format_datetime(todo.updated_at),
+            "due_date": format_datetime(todo.due_date),
+            "status": todo.status,
+            "tags": [tag.name for tag in todo.tags.all()],
+        }
+
+
+def _chunked(lines):
+    # Join small lines so the server is not asked to write each row alone
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= EXPORT_LINES_PER_CHUNK:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def ndjson_stream(rows):
+    return _chunked(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+class _Echo:
+    """
+    File-like object whose write() just returns the value, so csv.writer
+    can format one line at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(EXPORT_FIELDS)
+        for row in rows:
+            row["tags"] = ",".join(row["tags"])
+            yield writer.writerow([row[field] for field in EXPORT_FIELDS])
+
+    return _chunked(lines())
@@ -0,0 +1,74 @@
+from datetime import datetime, time
+
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Tag, Todo
+
+
+def parse_due(name, value):
+    """
+    Parse a due_before/due_after bound given as an ISO datetime or date.
+    """
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({name: "Enter a valid date or datetime."})
+        moment = datetime.combine(day, time.min)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.get_current_timezone())
+    return moment
+
+
+class TodoFilterBackend(BaseFilterBackend):
+    """
+    Server-side filters for the todo list:
+
+    * ``status`` -- one status, or several separated by commas
+    * ``due_before`` / ``due_after`` -- due date range (exclusive / inclusive)
+    * ``tag`` -- tag name, case-insensitive
+
+    Each filter is backed by a composite index, see Todo.Meta.indexes.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if "status" in params:
+            statuses = [s.strip().upper() for s in params["status"].split(",")]
+            valid = {value for value, _ in Todo.STATUS_CHOICES}
+            invalid = [s for s in statuses if s not in valid]
+            if invalid:
+                raise ValidationError(
+                    {"status": f"Invalid status: {', '.join(invalid)}."}
+                )
+            queryset = queryset.filter(status__in=statuses)
+
+        if "due_after" in params:
+            queryset = queryset.filter(
+                due_date__gte=parse_due("due_after", params["due_after"])
+            )
+        if "due_before" in params:
+            queryset = queryset.filter(
+                due_date__lt=parse_due("due_before", params["due_before"])
+            )
+
+        if "tag" in params:
+            # Look the tag up through the (lower(name), user) unique index and
+            # the todos through the (tag_id, todo_id) through-table index
+            tag_ids = (
+                Tag.objects.annotate(lower_name=Lower("name"))
+                .filter(user=request.user, lower_name=params["tag"].strip().lower())
+                .values("id")
+            )
+            queryset = queryset.filter(
+                id__in=Todo.tags.through.objects.filter(tag_id__in=tag_ids).values(
+                    "todo_id"
+                )
+            )
+
+        return queryset
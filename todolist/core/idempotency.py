@@ -0,0 +1,96 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+KEY_MAX_LENGTH = IdempotencyKey._meta.get_field("key").max_length
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+def idempotency_ttl():
+    return timedelta(hours=getattr(settings, "IDEMPOTENCY_KEY_TTL_HOURS", 24))
+
+
+def request_fingerprint(request):
+    # Same key with a different method, path or body is a client bug
+    digest = hashlib.md5()
+    for part in (request.method.encode(), request.path.encode(), request.body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def replay(request, key, fingerprint):
+    """
+    Return the stored response for ``key``, or None if there is no live one.
+    Expired entries are deleted so the key can be stored again.
+    """
+    stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+    if stored is None:
+        return None
+    if stored.created_at < timezone.now() - idempotency_ttl():
+        stored.delete()
+        return None
+    if stored.fingerprint != fingerprint:
+        raise IdempotencyKeyReused()
+    return Response(
+        stored.response,
+        status=stored.status_code,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+def idempotent(request, handler, *args, **kwargs):
+    """
+    Run ``handler`` once per Idempotency-Key header value.
+
+    A successful response is stored in the same transaction as the writes
+    it reports, so a retry either replays it (skipping validation and
+    inserts) or, if the first attempt failed, runs again. Requests without
+    the header are handled as usual.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        return handler(request, *args, **kwargs)
+    if not key or len(key) > KEY_MAX_LENGTH:
+        raise ValidationError(
+            {IDEMPOTENCY_HEADER: f"Must be 1 to {KEY_MAX_LENGTH} characters."}
+        )
+
+    # Read the body now, before the parsers consume the request stream
+    fingerprint = request_fingerprint(request)
+    response = replay(request, key, fingerprint)
+    if response is not None:
+        return response
+
+    try:
+        with transaction.atomic():
+            response = handler(request, *args, **kwargs)
+            if status.is_success(response.status_code):
+                IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=key,
+                    fingerprint=fingerprint,
+                    status_code=response.status_code,
+                    response=response.data,
+                )
+    except IntegrityError:
+        # A concurrent request with the same key committed first; this
+        # attempt's writes were rolled back, so answer with the stored result
+        response = replay(request, key, fingerprint)
+        if response is None:
+            raise
+    return response
@@ -0,0 +1,138 @@
+import csv
+import json
+from collections import Counter
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from .cache import bump_todo_version
+from .models import Tag, Todo, TodoStatusCount
+from .serializers import TodoSerializer
+
+# Columns checked by the matching TodoSerializer field
+FIELDS = ["title", "description", "status", "due_date"]
+
+
+def _messages(detail):
+    # Flatten a DRF error detail (possibly nested, e.g. per tag) to strings
+    if isinstance(detail, dict):
+        return [m for value in detail.values() for m in _messages(value)]
+    if isinstance(detail, list):
+        return [m for value in detail for m in _messages(value)]
+    return [str(detail)]
+
+
+def read_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Still yield so row numbering (and resuming) stays aligned
+            yield None
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        # Exported CSV holds tag names comma-separated in one column
+        tags = row.get("tags") or ""
+        row["tags"] = [name for name in tags.split(",") if name.strip()]
+        yield row
+
+
+READERS = {"ndjson": read_ndjson, "csv": read_csv}
+
+
+class RowValidator:
+    """
+    Validates import rows with TodoSerializer's fields and Todo's model
+    checks, without building a serializer per row.
+    """
+
+    def __init__(self):
+        self.serializer = TodoSerializer()
+        self.fields = self.serializer.fields
+
+    def __call__(self, row):
+        """
+        Return the Todo field values and tag names for ``row``, or raise
+        ValidationError with a per-field message dict.
+        """
+        if not isinstance(row, dict):
+            raise ValidationError({"row": "Expected a JSON object."})
+
+        errors = {}
+        values = {}
+        for name in FIELDS:
+            value = row.get(name)
+            if value is None or value == "":
+                # Optional (empty CSV cells too); title is checked below
+                continue
+            try:
+                values[name] = self.fields[name].run_validation(value)
+                if name == "due_date":
+                    self.serializer.validate_due_date(values[name])
+            except serializers.ValidationError as exc:
+                errors[name] = _messages(exc.detail)
+        if "title" not in values and "title" not in errors:
+            errors["title"] = "This field is required"
+
+        tags = row.get("tags") or []
+        if isinstance(tags, list):
+            # Plain names (CSV, or NDJSON shorthand) or {"name": ...} objects
+            tags = [{"name": tag} if isinstance(tag, str) else tag for tag in tags]
+        tag_names = []
+        try:
+            tags = self.fields["tags"].run_validation(tags)
+            self.serializer.validate_tags(tags)
+            tag_names = [tag["name"].strip().lower() for tag in tags]
+        except serializers.ValidationError as exc:
+            errors["tags"] = _messages(exc.detail)
+
+        if errors:
+            raise ValidationError(errors)
+
+        # Status choices and Todo.clean(), as Todo.save() would check them
+        todo = Todo(**values)
+        todo.full_clean(exclude=["user"], validate_unique=False)
+
+        fields = {name: getattr(todo, name) for name in FIELDS}
+        return fields, tag_names
+
+
+def import_batch(job, batch):
+    """
+    Insert one batch of validated rows and advance the job's checkpoint in
+    the same transaction, so a crash never commits rows twice.
+
+    ``batch`` is a list of (fields, tag_names) pairs; ``job.rows_done`` must
+    already count every row in the batch, valid or not.
+    """
+    user = job.user
+    with transaction.atomic():
+        todos = Todo.objects.bulk_create(
+            [Todo(user_id=user.pk, **fields) for fields, _ in batch]
+        )
+        tags = Tag.resolve_names(user, {n for _, names in batch for n in names})
+        # Through-rows need no primary keys back, so skip building model
+        # instances and let the driver insert plain tuples
+        through = Todo.tags.through._meta
+        links = [
+            (todo.pk, tags[name].pk)
+            for todo, (_, names) in zip(todos, batch)
+            for name in names
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {connection.ops.quote_name(through.db_table)} "
+                "(todo_id, tag_id) VALUES (%s, %s)",
+                links,
+            )
+        Tag.adjust_todo_counts(Counter(tag_id for _, tag_id in links))
+        TodoStatusCount.adjust(Counter((user.pk, todo.status) for todo in todos))
+        job.save(update_fields=["rows_done", "updated_at"])
+        bump_todo_version(user.pk)
+    return len(todos)
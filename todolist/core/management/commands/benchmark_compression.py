@@ -0,0 +1,82 @@
+import json
+import time
+from itertools import islice
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.compression import CODECS
+from core.export import export_rows, ndjson_stream
+from core.management.commands.benchmark_json import sample_page
+from core.models import Todo
+from core.readers import TodoReader
+from core.renderers import FastJSONRenderer
+
+# Levels tried per encoding, cheapest first
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 6, 11], "zstd": [1, 3, 9, 19]}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure CPU time and bytes saved by each installed response "
+        "encoding and level on a todo list page and an NDJSON export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--user",
+            help="Benchmark this user's newest todos instead of generated ones",
+        )
+
+    def best(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["user"]}" does not exist.')
+            reader = TodoReader()
+            queryset = Todo.objects.filter(user=user).order_by("-created_at", "-id")
+            page = {"results": reader.serialize(reader.queryset(queryset)[:rows])}
+            body = FastJSONRenderer().render(page)
+            rows = list(islice(export_rows(user), rows))
+        else:
+            body = FastJSONRenderer().render(sample_page(rows))
+            # Export rows hold formatted datetimes and tag names
+            rows = [
+                dict(row, tags=[tag["name"] for tag in row["tags"]])
+                for row in json.loads(body)["results"]
+            ]
+        chunks = [chunk.encode() for chunk in ndjson_stream(rows)]
+        payloads = [
+            ("list", lambda codec, level: codec.compress(body, level), len(body)),
+            (
+                "export",
+                lambda codec, level: b"".join(codec.stream(iter(chunks), level)),
+                sum(map(len, chunks)),
+            ),
+        ]
+
+        for name, run, size in payloads:
+            self.stdout.write(f"{name}: {size} bytes")
+            for codec in CODECS.values():
+                for level in LEVELS[codec.name]:
+                    seconds, compressed = self.best(
+                        lambda: run(codec, level), options["repeat"]
+                    )
+                    self.stdout.write(
+                        f"  {codec.name:<4} level {level:>2}: "
+                        f"{seconds * 1000:7.1f} ms, {len(compressed):>8} bytes "
+                        f"({len(compressed) / size:.1%}), "
+                        f"{size / seconds / 1e6:.0f} MB/s"
+                    )
@@ -0,0 +1,98 @@
+import io
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Todo
+from core.parsers import FastJSONParser
+from core.readers import TodoReader
+from core.renderers import FastJSONRenderer, orjson
+
+
+def sample_page(rows):
+    # A list response shaped like TodoReader output, with typical lengths
+    now = timezone.now()
+    todos = []
+    for i in range(rows):
+        created = now - timedelta(minutes=i, microseconds=i)
+        todos.append(
+            {
+                "id": i + 1,
+                "title": f"Follow up on ticket #{i} with the café team",
+                "description": "Collect the notes and draft a reply. " * (i % 8),
+                "created_at": created,
+                "updated_at": created,
+                "due_date": created + timedelta(days=7) if i % 3 else None,
+                "status": "OPEN" if i % 4 else "COMPLETED",
+                "tags": [{"id": t, "name": f"tag{t}"} for t in range(i % 4)],
+            }
+        )
+    return {"next": None, "previous": None, "results": todos}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSON renderer and parser with the orjson-backed "
+        "ones on a todo list payload."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--user",
+            help="Benchmark this user's newest todos instead of generated ones",
+        )
+
+    def best(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed; nothing to compare.")
+
+        rows, repeat = options["rows"], options["repeat"]
+        if options["user"]:
+            try:
+                user = User.objects.get(username=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f'User "{options["user"]}" does not exist.')
+            reader = TodoReader()
+            queryset = Todo.objects.filter(user=user).order_by("-created_at", "-id")
+            page = reader.serialize(reader.queryset(queryset)[:rows])
+            payloads = {"serialized": {"results": page}}
+        else:
+            raw = sample_page(rows)
+            # Serializer output holds strings; raw dicts hold datetimes
+            serialized = FastJSONRenderer().render(raw)
+            payloads = {
+                "serialized": FastJSONParser().parse(io.BytesIO(serialized)),
+                "datetimes": raw,
+            }
+
+        for name, data in payloads.items():
+            body = JSONRenderer().render(data)
+            stdlib = self.best(lambda: JSONRenderer().render(data), repeat)
+            fast = self.best(lambda: FastJSONRenderer().render(data), repeat)
+            self.stdout.write(
+                f"render {name} ({len(body)} bytes): stdlib {stdlib * 1000:.1f} ms, "
+                f"orjson {fast * 1000:.1f} ms ({stdlib / fast:.1f}x)"
+            )
+
+        body = JSONRenderer().render(payloads["serialized"])
+        stdlib = self.best(lambda: JSONParser().parse(io.BytesIO(body)), repeat)
+        fast = self.best(lambda: FastJSONParser().parse(io.BytesIO(body)), repeat)
+        self.stdout.write(
+            f"parse ({len(body)} bytes): stdlib {stdlib * 1000:.1f} ms, "
+            f"orjson {fast * 1000:.1f} ms ({stdlib / fast:.1f}x)"
+        )
@@ -0,0 +1,127 @@
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.importer import READERS, RowValidator, import_batch
+from core.models import ImportJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream todos for a user from an NDJSON or CSV file (or - for stdin) "
+        "and insert them in batches. Progress is checkpointed per batch, so "
+        "re-running an unfinished job resumes after the last committed batch; "
+        "a finished job is only run again with --restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path to the input file, or - for stdin")
+        parser.add_argument("--user", required=True, help="Username to import for")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format (default: from the file extension, else ndjson)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows committed per transaction",
+        )
+        parser.add_argument(
+            "--job",
+            help="Checkpoint name used for resuming (default: the source path)",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Ignore any checkpoint and start from the first row",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options["user"]})
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+
+        source = options["source"]
+        fmt = options["format"] or ("csv" if source.endswith(".csv") else "ndjson")
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        job, _ = ImportJob.objects.get_or_create(
+            name=options["job"] or source, defaults={"user": user}
+        )
+        if job.user_id != user.pk:
+            raise CommandError(f"Job '{job.name}' belongs to another user.")
+        if options["restart"]:
+            job.rows_done = 0
+            job.completed_at = None
+        elif job.completed_at:
+            # Same name, possibly new input (always so for stdin): resuming
+            # would silently skip rows that were never imported
+            raise CommandError(
+                f"Job '{job.name}' already finished; pass --restart to import "
+                "it again or --job to name a new one."
+            )
+        skip = job.rows_done
+        if skip:
+            self.stdout.write(f"Resuming job '{job.name}' after row {skip}.")
+
+        if source == "-":
+            stream = sys.stdin
+        else:
+            try:
+                stream = open(source, newline="", encoding="utf-8")
+            except OSError as exc:
+                raise CommandError(f"Cannot read '{source}': {exc}")
+
+        validate = RowValidator()
+        batch = []
+        imported = invalid = position = 0
+        started = time.perf_counter()
+        try:
+            for position, row in enumerate(READERS[fmt](stream), start=1):
+                if position <= skip:
+                    continue
+                try:
+                    batch.append(validate(row))
+                except ValidationError as exc:
+                    invalid += 1
+                    self.stderr.write(f"Row {position}: {exc.message_dict}")
+
+                if position - job.rows_done >= batch_size:
+                    job.rows_done = position
+                    imported += import_batch(job, batch)
+                    batch = []
+                    if options["verbosity"] >= 2:
+                        rate = self.rate(imported, started)
+                        self.stdout.write(
+                            f"Committed {imported} todos ({rate:.0f} rows/s)"
+                        )
+
+            if position > job.rows_done:
+                job.rows_done = position
+                imported += import_batch(job, batch)
+            job.completed_at = timezone.now()
+            job.save(update_fields=["completed_at", "updated_at"])
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        rate = self.rate(imported, started)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} todos ({invalid} invalid rows skipped) "
+                f"at {rate:.0f} rows/s."
+            )
+        )
+
+    def rate(self, imported, started):
+        return imported / max(time.perf_counter() - started, 1e-9)
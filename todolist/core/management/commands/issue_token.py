@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+
+class Command(BaseCommand):
+    help = "Issue an API token for a user, printing its key."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument(
+            "--rotate",
+            action="store_true",
+            help="Replace the user's existing token with a new one",
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options["username"]})
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        if options["rotate"]:
+            # Delete one by one so the post_delete eviction signal fires
+            for token in Token.objects.filter(user=user):
+                token.delete()
+
+        token, _ = Token.objects.get_or_create(user=user)
+        self.stdout.write(token.key)
@@ -0,0 +1,116 @@
+import time
+from collections import Counter, defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import bump_todo_version
+from core.models import Todo, TodoStatusCount
+
+# Statuses that become OVERDUE once the due date has passed
+ACTIVE_STATUSES = ["OPEN", "WORKING", "PENDING_REVIEW"]
+
+
+def mark_overdue_batch(now, batch_size):
+    """
+    Flip up to ``batch_size`` past-due active todos to OVERDUE and
+    invalidate the affected users' caches. Returns the number of todos
+    changed.
+    """
+    with transaction.atomic():
+        rows = list(
+            Todo.objects.select_for_update()
+            .filter(status__in=ACTIVE_STATUSES, due_date__lt=now)
+            .order_by()
+            .values_list("id", "user_id", "status")[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        by_status = defaultdict(list)
+        for pk, user_id, status in rows:
+            by_status[status].append((pk, user_id))
+
+        # update() sends no signals, so touch updated_at for delta sync and
+        # move the status counts here
+        stamp = timezone.now()
+        deltas = Counter()
+        updated = 0
+        for status, todos in by_status.items():
+            ids = [pk for pk, _ in todos]
+            # SQLite ignores select_for_update(), so a row may have changed
+            # since it was read: re-check it in the UPDATE, one status at a
+            # time so the rollup moves each todo out of the right status
+            changed = Todo.objects.filter(
+                id__in=ids, status=status, due_date__lt=now
+            ).update(status="OVERDUE", updated_at=stamp)
+            if changed < len(todos):
+                # Skipped rows are left for the next sweep; count only ours
+                user_ids = Todo.objects.filter(
+                    id__in=ids, status="OVERDUE", updated_at=stamp
+                ).values_list("user_id", flat=True)
+            else:
+                user_ids = [user_id for _, user_id in todos]
+            for user_id in user_ids:
+                deltas[user_id, status] -= 1
+                deltas[user_id, "OVERDUE"] += 1
+            updated += changed
+
+        TodoStatusCount.adjust(deltas)
+        bump_todo_version(*(user_id for user_id, _ in deltas))
+    return updated
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark past-due OPEN, WORKING and PENDING_REVIEW todos as OVERDUE in "
+        "small batches, optionally as a long-running loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Todos updated per statement (keeps SQLite write locks short)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.05,
+            help="Seconds to pause between batches",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, sweeping again every --interval seconds",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=60,
+            help="Seconds between sweeps when running with --loop",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        while True:
+            marked = self.sweep(options["batch_size"], options["sleep"])
+            if options["verbosity"] >= 1:
+                self.stdout.write(f"Marked {marked} todo(s) as OVERDUE.")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+    def sweep(self, batch_size, pause):
+        now = timezone.now()
+        total = 0
+        while True:
+            updated = mark_overdue_batch(now, batch_size)
+            total += updated
+            if updated < batch_size:
+                return total
+            time.sleep(pause)
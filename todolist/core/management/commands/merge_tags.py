@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk import merge_tags
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge a user's tags into one target tag across all of their todos, "
+        "or rename a tag when a single source is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("target", help="Tag to merge into (created by renaming)")
+        parser.add_argument("sources", nargs="+", help="Tags to merge away")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(**{User.USERNAME_FIELD: options["username"]})
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["username"]}" does not exist.')
+
+        try:
+            target, changed = merge_tags(user, options["sources"], options["target"])
+        except ValidationError as exc:
+            raise CommandError(exc.messages[0])
+
+        self.stdout.write(
+            f'Merged into "{target.name}": {changed} todo(s) changed, '
+            f"{target.num_todos} now tagged."
+        )
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.idempotency import idempotency_ttl
+from core.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL_HOURS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement (keeps SQLite write locks short)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - idempotency_ttl()
+        expired = IdempotencyKey.objects.filter(created_at__lt=cutoff)
+
+        purged = 0
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            purged += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(f"Purged {purged} idempotency key(s).")
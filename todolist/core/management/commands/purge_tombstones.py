@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Tombstone
+from core.sync import tombstone_retention
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement (keeps SQLite write locks short)",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - tombstone_retention()
+        expired = Tombstone.objects.filter(deleted_at__lt=cutoff)
+
+        purged = 0
+        while True:
+            ids = list(expired.values_list("pk", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+            purged += Tombstone.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(f"Purged {purged} tombstone(s).")
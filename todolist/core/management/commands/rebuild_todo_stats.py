@@ -0,0 +1,75 @@
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import Todo, TodoStatusCount
+
+
+class Command(BaseCommand):
+    help = (
+        "Check the per-user status counts behind the stats endpoint against "
+        "core_todo and rebuild them if they differ. Tag counts are checked "
+        "with recount_tags."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report wrong counts, exiting with an error if any are found",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            actual = {
+                (user_id, status): total
+                for user_id, status, total in Todo.objects.order_by()
+                .values_list("user_id", "status")
+                .annotate(total=Count("id"))
+            }
+            stored = {
+                (user_id, status): count
+                for user_id, status, count in TodoStatusCount.objects.values_list(
+                    "user_id", "status", "count"
+                )
+            }
+            wrong = sorted(
+                key
+                for key in actual.keys() | stored.keys()
+                if actual.get(key, 0) != stored.get(key, 0)
+            )
+            for user_id, status in wrong:
+                self.stdout.write(
+                    f"User {user_id} {status}: stored "
+                    f"{stored.get((user_id, status), 0)}, "
+                    f"actual {actual.get((user_id, status), 0)}."
+                )
+
+            if not wrong:
+                self.stdout.write("All status counts are correct.")
+            elif options["check"]:
+                raise CommandError(f"{len(wrong)} status count(s) are wrong.")
+            else:
+                TodoStatusCount.objects.all().delete()
+                TodoStatusCount.objects.bulk_create(
+                    (
+                        TodoStatusCount(
+                            user_id=user_id,
+                            status=status,
+                            count=actual.get((user_id, status), 0),
+                        )
+                        for user_id in User.objects.values_list("pk", flat=True)
+                        for status, _ in Todo.STATUS_CHOICES
+                    ),
+                    batch_size=1000,
+                )
+                self.stdout.write(f"Rebuilt status counts ({len(wrong)} were wrong).")
+
+        call_command(
+            "recount_tags",
+            check=options["check"],
+            stdout=self.stdout,
+            stderr=self.stderr,
+        )
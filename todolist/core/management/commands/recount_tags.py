@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from core.models import Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify the stored per-tag todo counts against the through-table and "
+        "repair any that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only report wrong counts, exiting with an error if any are found",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            wrong = (
+                Tag.objects.annotate(actual=Tag.counted_todos())
+                .exclude(num_todos=F("actual"))
+                .order_by("pk")
+            )
+            mismatches = list(wrong.values_list("pk", "name", "num_todos", "actual"))
+            for pk, name, stored, actual in mismatches:
+                self.stdout.write(
+                    f'Tag {pk} "{name}": stored {stored}, actual {actual}.'
+                )
+
+            if options["check"]:
+                if mismatches:
+                    raise CommandError(f"{len(mismatches)} tag count(s) are wrong.")
+                self.stdout.write("All tag counts are correct.")
+                return
+
+            if mismatches:
+                Tag.recount_todos(Tag.objects.filter(pk__in=wrong.values("pk")))
+            self.stdout.write(f"Fixed {len(mismatches)} tag count(s).")
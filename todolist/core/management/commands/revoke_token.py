@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+
+class Command(BaseCommand):
+    help = "Revoke API tokens by username or by token key."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", nargs="?")
+        parser.add_argument("--key", help="Revoke a single token by its key")
+
+    def handle(self, *args, **options):
+        if options["key"]:
+            tokens = Token.objects.filter(key=options["key"])
+        elif options["username"]:
+            User = get_user_model()
+            lookup = {f"user__{User.USERNAME_FIELD}": options["username"]}
+            tokens = Token.objects.filter(**lookup)
+        else:
+            raise CommandError("Provide a username or --key.")
+
+        revoked = 0
+        for token in tokens:
+            token.delete()
+            revoked += 1
+
+        if not revoked:
+            raise CommandError("No matching token found.")
+        self.stdout.write(f"Revoked {revoked} token(s).")
@@ -0,0 +1,71 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from .compression import negotiate
+
+# HTML pages carry CSRF tokens and are left alone (see BREACH)
+DEFAULT_CONTENT_TYPES = [
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+]
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress API responses with the best encoding the client accepts:
+    br or zstd when installed, otherwise gzip.
+
+    Buffered responses are compressed when they reach
+    COMPRESSION_MIN_SIZE bytes; streaming responses (e.g. the export) are
+    compressed chunk by chunk as they are sent. Levels per encoding come
+    from COMPRESSION_LEVELS.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0].strip()
+        content_types = getattr(
+            settings, "COMPRESSION_CONTENT_TYPES", DEFAULT_CONTENT_TYPES
+        )
+        if response.has_header("Content-Encoding") or (
+            content_type.lower() not in content_types
+        ):
+            return response
+        if not response.streaming and len(response.content) < getattr(
+            settings, "COMPRESSION_MIN_SIZE", 1024
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING"))
+        if codec is None:
+            return response
+        level = getattr(settings, "COMPRESSION_LEVELS", {}).get(codec.name)
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = codec.astream(
+                    response.streaming_content, level
+                )
+            else:
+                response.streaming_content = codec.stream(
+                    response.streaming_content, level
+                )
+            del response["Content-Length"]
+        else:
+            compressed = codec.compress(response.content, level)
+            # Not worth it if nothing was saved
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # The bytes differ per encoding, so a strong ETag becomes weak;
+        # If-None-Match uses weak comparison and still matches it
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = codec.name
+        return response
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_remove_tag_unique_lowercase_tag_name_tag_user_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "created_at", "id"], name="todo_user_created_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_todo_user_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="todo",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text="Timestamp of last update (automatically set)",
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0010_todo_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("todo", "Todo"), ("tag", "Tag")],
+                        help_text="Type of the deleted object",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "object_id",
+                    models.BigIntegerField(
+                        help_text="Primary key of the deleted object"
+                    ),
+                ),
+                (
+                    "deleted_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        help_text="Timestamp of deletion (automatically set)",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, help_text="Timestamp of last update (automatically set)"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["user", "updated_at"], name="tag_user_updated_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "updated_at"], name="todo_user_updated_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tombstone",
+            name="user",
+            field=models.ForeignKey(
+                help_text="Owner of the deleted object",
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tombstones",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(
+                fields=["user", "deleted_at"], name="tombstone_user_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0011_sync_change_tracking"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        help_text="Import job name", max_length=255, unique=True
+                    ),
+                ),
+                (
+                    "rows_done",
+                    models.PositiveBigIntegerField(
+                        default=0, help_text="Input rows committed (valid or skipped)"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, help_text="Timestamp of the last committed batch"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="User the todos are imported for",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
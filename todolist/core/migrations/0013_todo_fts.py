@@ -0,0 +1,77 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:30
+
+from django.db import migrations
+
+# Contentless FTS5 index over todo titles and descriptions. The owner column
+# holds "u<user_id>" so searches are scoped per user inside the index itself.
+# Note: SQLite drops these triggers if core_todo is ever rebuilt by a later
+# migration, so such a migration must re-run FORWARD_SQL.
+FORWARD_SQL = [
+    """
+    CREATE VIRTUAL TABLE core_todo_fts USING fts5(
+        owner, title, description,
+        content='',
+        prefix='2 3',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_todo_fts_ai AFTER INSERT ON core_todo BEGIN
+        INSERT INTO core_todo_fts(rowid, owner, title, description)
+        VALUES (new.id, 'u' || new.user_id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_todo_fts_ad AFTER DELETE ON core_todo BEGIN
+        INSERT INTO core_todo_fts(core_todo_fts, rowid, owner, title, description)
+        VALUES ('delete', old.id, 'u' || old.user_id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_todo_fts_au AFTER UPDATE OF title, description, user_id
+    ON core_todo
+    WHEN old.title IS NOT new.title
+        OR old.description IS NOT new.description
+        OR old.user_id IS NOT new.user_id
+    BEGIN
+        INSERT INTO core_todo_fts(core_todo_fts, rowid, owner, title, description)
+        VALUES ('delete', old.id, 'u' || old.user_id, old.title, old.description);
+        INSERT INTO core_todo_fts(rowid, owner, title, description)
+        VALUES (new.id, 'u' || new.user_id, new.title, new.description);
+    END
+    """,
+    """
+    INSERT INTO core_todo_fts(rowid, owner, title, description)
+    SELECT id, 'u' || user_id, title, description FROM core_todo
+    """,
+]
+
+REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS core_todo_fts_au",
+    "DROP TRIGGER IF EXISTS core_todo_fts_ad",
+    "DROP TRIGGER IF EXISTS core_todo_fts_ai",
+    "DROP TABLE IF EXISTS core_todo_fts",
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        # Full-text search is SQLite specific; other backends fall back to
+        # LIKE queries in core.search
+        if schema_editor.connection.vendor != "sqlite":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_importjob"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(FORWARD_SQL), run_sqlite(REVERSE_SQL)),
+    ]
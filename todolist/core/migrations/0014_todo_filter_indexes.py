@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_todo_fts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["user", "status", "created_at"], name="todo_user_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(fields=["user", "due_date"], name="todo_user_due_idx"),
+        ),
+        # The auto-created M2M table cannot declare indexes in Meta; this
+        # covering index serves "todos with tag X" lookups
+        migrations.RunSQL(
+            "CREATE INDEX core_todo_tags_tag_todo_idx "
+            "ON core_todo_tags (tag_id, todo_id)",
+            "DROP INDEX core_todo_tags_tag_todo_idx",
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_todo_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="todo",
+            index=models.Index(
+                fields=["status", "due_date"], name="todo_status_due_idx"
+            ),
+        ),
+    ]
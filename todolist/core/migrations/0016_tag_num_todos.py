@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:44
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_todos(apps, schema_editor):
+    Tag = apps.get_model("core", "Tag")
+    Todo = apps.get_model("core", "Todo")
+    links = (
+        Todo.tags.through.objects.filter(tag_id=OuterRef("pk"))
+        .order_by()
+        .values("tag_id")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    Tag.objects.update(num_todos=Coalesce(Subquery(links), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_todo_status_due_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="num_todos",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, help_text="Number of todos with this tag"
+            ),
+        ),
+        migrations.RunPython(count_todos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+
+def build_rollup(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    Todo = apps.get_model("core", "Todo")
+    TodoStatusCount = apps.get_model("core", "TodoStatusCount")
+    counts = {
+        (row["user_id"], row["status"]): row["total"]
+        for row in Todo.objects.order_by()
+        .values("user_id", "status")
+        .annotate(total=Count("id"))
+    }
+    statuses = [status for status, _ in Todo._meta.get_field("status").choices]
+    TodoStatusCount.objects.bulk_create(
+        (
+            TodoStatusCount(
+                user_id=user_id, status=status, count=counts.get((user_id, status), 0)
+            )
+            for user_id in User.objects.values_list("pk", flat=True).iterator()
+            for status in statuses
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("core", "0016_tag_num_todos"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoStatusCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("OPEN", "Open"),
+                            ("WORKING", "Working"),
+                            ("PENDING_REVIEW", "Pending Review"),
+                            ("COMPLETED", "Completed"),
+                            ("OVERDUE", "Overdue"),
+                            ("CANCELLED", "Cancelled"),
+                        ],
+                        help_text="Todo status",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of the user's todos in this status"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        help_text="Owner of the counted todos",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_counts",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="todostatuscount",
+            constraint=models.UniqueConstraint(
+                fields=("user", "status"), name="unique_status_count"
+            ),
+        ),
+        migrations.RunPython(build_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.7 on 2026-10-17 04:53
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_todostatuscount"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                models.F("user"),
+                django.db.models.functions.text.Lower("name"),
+                name="tag_user_lower_name_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import time
+
+
+def seed_versions(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    TodoVersion = apps.get_model("core", "TodoVersion")
+    version = time.time_ns()
+    TodoVersion.objects.bulk_create(
+        (
+            TodoVersion(user_id=user_id, version=version)
+            for user_id in User.objects.values_list("pk", flat=True).iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("core", "0019_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TodoVersion",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        help_text="Owner of the versioned todos",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="todo_version",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(
+                        help_text="Bumped on every change to the user's todos or tags"
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(seed_versions, migrations.RunPython.noop),
+    ]
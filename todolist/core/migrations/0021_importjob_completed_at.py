@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-17 05:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0020_todoversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="completed_at",
+            field=models.DateTimeField(
+                blank=True, help_text="When the whole input was imported", null=True
+            ),
+        ),
+    ]
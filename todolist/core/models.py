@@ -1,9 +1,23 @@
-from django.db import models
+import time
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from django.db.models import UniqueConstraint
-from django.db.models.functions import Lower
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Q,
+    Subquery,
+    UniqueConstraint,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Lower
+
+from .cache import tag_cache
 
 
 class Todo(models.Model):
@@ -21,6 +35,10 @@ class Todo(models.Model):
     created_at = models.DateTimeField(
         auto_now_add=True, help_text="Timestamp of task creation (automatically set)"
     )
+    # Timestamp of the last change (automatically set)
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="Timestamp of last update (automatically set)"
+    )
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -79,18 +97,44 @@ class Todo(models.Model):
         if not self.title:
             raise ValidationError("Title cannot be empty.")
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the status rollup counts this todo under, so a save
+        # can move it without re-reading the row
+        if "user_id" in field_names and "status" in field_names:
+            instance._counted_as = (instance.user_id, instance.status)
+        return instance
+
     # Save method to ensure validation is run
     def save(self, *args, **kwargs):
         self.full_clean()  # Trigger all validations
         return super().save(*args, **kwargs)
 
     # Method to set tags for the task
-    def set_tags(self, tag_names):
-        self.tags.clear()  # Remove existing tags
-        for tag_name in set(tag_names):
-            normalized_tag = tag_name.strip().lower()  # Normalize tag
-            tag, created = Tag.objects.get_or_create(name=normalized_tag)
-            self.tags.add(tag)  # Associate tag with the task
+    def set_tags(self, tag_names, resolved=None):
+        # Resolve the user's tags in one batch and only write the difference
+        # to the through-table, so unchanged tags cost no writes. Callers
+        # that already resolved the names (see Tag.resolve_names) pass them
+        # as ``resolved`` to skip the lookup
+        with transaction.atomic():
+            names = {name.strip().lower() for name in tag_names}
+            if resolved is not None and names <= resolved.keys():
+                tags = {name: resolved[name] for name in names}
+            else:
+                tags = Tag.resolve_names(self.user, names)
+            wanted = {tag.pk for tag in tags.values()}
+            current = set(
+                Todo.tags.through.objects.filter(todo=self).values_list(
+                    "tag_id", flat=True
+                )
+            )
+            removed = current - wanted
+            added = wanted - current
+            if removed:
+                self.tags.remove(*removed)
+            if added:
+                self.tags.add(*added)
 
     def __str__(self):
         return f"{self.title} - {self.status}"
@@ -99,6 +143,22 @@ class Todo(models.Model):
         ordering = ["-created_at"]  # Sort tasks by newest first
         verbose_name = "Todo Item"  # Singular form for admin
         verbose_name_plural = "Todo Items"  # Plural form for admin
+        indexes = [
+            # Backs keyset pagination of a user's todos, newest first
+            models.Index(
+                fields=["user", "created_at", "id"], name="todo_user_created_idx"
+            ),
+            # Backs "changes since" sync queries
+            models.Index(fields=["user", "updated_at"], name="todo_user_updated_idx"),
+            # Back the status and due date filters (and due date ordering);
+            # created_at lets a status filter keep the default order
+            models.Index(
+                fields=["user", "status", "created_at"], name="todo_user_status_idx"
+            ),
+            models.Index(fields=["user", "due_date"], name="todo_user_due_idx"),
+            # Lets the overdue sweeper find past-due active todos directly
+            models.Index(fields=["status", "due_date"], name="todo_status_due_idx"),
+        ]
 
 
 class Tag(models.Model):
@@ -113,6 +173,14 @@ class Tag(models.Model):
         related_name="tags",
         help_text="User who created the tag",
     )
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="Timestamp of last update (automatically set)"
+    )
+    # Number of todos carrying this tag, kept up to date by the database
+    # writes that link or unlink todos (see adjust_todo_counts)
+    num_todos = models.PositiveIntegerField(
+        default=0, editable=False, help_text="Number of todos with this tag"
+    )
 
     # Clean method to normalize tag name
     def clean(self):
@@ -120,13 +188,85 @@ class Tag(models.Model):
 
     def save(self, *args, **kwargs):
         self.clean()  # Normalize before saving
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Never write back a stale in-memory copy of the stored count
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "num_todos"
+            ]
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
     def todo_count(self):
-        return str(self.todos.count())  # Count associated todos
+        # The stored count as loaded; refresh_from_db(fields=["num_todos"])
+        # first when todos may have been tagged since
+        return str(self.num_todos)
+
+    @classmethod
+    def adjust_todo_counts(cls, deltas):
+        """
+        Add ``deltas[tag_id]`` to each tag's stored todo count, with one
+        UPDATE per distinct delta.
+        """
+        by_delta = {}
+        for tag_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(tag_id)
+        for delta, tag_ids in by_delta.items():
+            cls.objects.filter(pk__in=tag_ids).update(num_todos=F("num_todos") + delta)
+
+    @classmethod
+    def recount_todos(cls, queryset=None):
+        """
+        Recompute the stored todo count of every tag in ``queryset`` (all
+        tags by default) from the through-table with a single UPDATE.
+        Returns the number of tags updated.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+        return queryset.update(num_todos=cls.counted_todos())
+
+    @staticmethod
+    def counted_todos():
+        """
+        Expression counting a tag's rows in the through-table, for use in
+        annotate() or update().
+        """
+        links = (
+            Todo.tags.through.objects.filter(tag_id=OuterRef("pk"))
+            .order_by()
+            .values("tag_id")
+            .annotate(total=Count("*"))
+            .values("total")
+        )
+        return Coalesce(Subquery(links), 0)
+
+    @classmethod
+    def resolve_names(cls, user, names):
+        """
+        Map normalized tag names to the user's Tag objects, creating any
+        missing tags with a single bulk insert.
+        """
+        names = {name.strip().lower() for name in names}
+        if not names:
+            return {}
+
+        tags = {
+            tag.lower_name: tag
+            for tag in cls.objects.annotate(lower_name=Lower("name")).filter(
+                user=user, lower_name__in=names
+            )
+        }
+        missing = [cls(name=name, user=user) for name in sorted(names - set(tags))]
+        if missing:
+            cls.objects.bulk_create(missing)
+            # bulk_create sends no post_save, so evict the autocomplete list
+            tag_cache.delete(user.pk)
+            tags.update((tag.name, tag) for tag in missing)
+        return tags
 
     class Meta:
         # Unique constraint for lowercase tag name per user
@@ -135,3 +275,230 @@ class Tag(models.Model):
                 Lower("name"), "user", name="unique_lowercase_tag_name_per_user"
             )
         ]
+        indexes = [
+            models.Index(fields=["user", "updated_at"], name="tag_user_updated_idx"),
+            # Prefix range scans for autocomplete within one user's tags
+            models.Index(F("user"), Lower("name"), name="tag_user_lower_name_idx"),
+        ]
+
+
+class TodoStatusCount(models.Model):
+    """
+    Rollup of how many todos each user has in each status, kept up to date
+    on every write so dashboard stats never scan core_todo.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="status_counts",
+        help_text="Owner of the counted todos",
+    )
+    status = models.CharField(
+        max_length=20, choices=Todo.STATUS_CHOICES, help_text="Todo status"
+    )
+    count = models.PositiveIntegerField(
+        default=0, help_text="Number of the user's todos in this status"
+    )
+
+    def __str__(self):
+        return f"{self.user_id} {self.status}: {self.count}"
+
+    @classmethod
+    def seed(cls, user_id):
+        """
+        Create the user's zero rows for every status.
+        """
+        cls.objects.bulk_create(
+            [cls(user_id=user_id, status=status) for status, _ in Todo.STATUS_CHOICES],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def adjust(cls, deltas):
+        """
+        Add ``deltas[(user_id, status)]`` to the stored counts with a single
+        UPDATE. Counts never drop below zero; if the rollup has drifted,
+        rebuild_todo_stats repairs it rather than failing the write.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        matches = [Q(user_id=user_id, status=status) for user_id, status in deltas]
+        rows = cls.objects.filter(Q(*matches, _connector=Q.OR))
+        change = Case(
+            *[
+                When(match, then=Value(delta))
+                for match, delta in zip(matches, deltas.values())
+            ],
+            default=Value(0),
+        )
+        if rows.update(count=Greatest(F("count") + change, 0)) < len(deltas):
+            # Rows are seeded per user, so this only follows a partial rebuild
+            existing = set(rows.values_list("user_id", "status"))
+            cls.objects.bulk_create(
+                [
+                    cls(user_id=user_id, status=status, count=max(delta, 0))
+                    for (user_id, status), delta in deltas.items()
+                    if (user_id, status) not in existing
+                ],
+                ignore_conflicts=True,
+            )
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["user", "status"], name="unique_status_count")
+        ]
+
+
+class TodoVersion(models.Model):
+    """
+    Per-user data version behind the todo list cache keys and ETags.
+
+    It is bumped in the same transaction as every write to the user's todos
+    or tags, from any process (web workers, management commands), so every
+    process sees the change as soon as it commits.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="todo_version",
+        help_text="Owner of the versioned todos",
+    )
+    version = models.PositiveBigIntegerField(
+        help_text="Bumped on every change to the user's todos or tags"
+    )
+
+    def __str__(self):
+        return f"{self.user_id}: {self.version}"
+
+    @classmethod
+    def seed(cls, *user_ids):
+        """
+        Create the users' version rows if they are missing. They start from
+        the clock so a version is never reused, e.g. by a recreated user
+        whose old cached lists are still around.
+        """
+        version = time.time_ns()
+        cls.objects.bulk_create(
+            [cls(user_id=user_id, version=version) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def current(cls, user_id):
+        version = (
+            cls.objects.filter(user_id=user_id)
+            .values_list("version", flat=True)
+            .first()
+        )
+        if version is None:
+            cls.seed(user_id)
+            version = cls.objects.values_list("version", flat=True).get(user_id=user_id)
+        return version
+
+    @classmethod
+    def bump(cls, *user_ids):
+        user_ids = set(user_ids)
+        rows = cls.objects.filter(user_id__in=user_ids)
+        if rows.update(version=F("version") + 1) < len(user_ids):
+            # Rows are seeded per user, so this only follows a manual cleanup
+            cls.seed(*user_ids - set(rows.values_list("user_id", flat=True)))
+
+
+class Tombstone(models.Model):
+    """
+    Deletion log used by delta sync to report deleted todos and tags.
+    """
+
+    KIND_CHOICES = [
+        ("todo", "Todo"),
+        ("tag", "Tag"),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="tombstones",
+        help_text="Owner of the deleted object",
+    )
+    kind = models.CharField(
+        max_length=10, choices=KIND_CHOICES, help_text="Type of the deleted object"
+    )
+    object_id = models.BigIntegerField(help_text="Primary key of the deleted object")
+    deleted_at = models.DateTimeField(
+        auto_now_add=True, help_text="Timestamp of deletion (automatically set)"
+    )
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"], name="tombstone_user_idx"),
+        ]
+
+
+class ImportJob(models.Model):
+    """
+    Checkpoint for a resumable bulk import: how many input rows of the named
+    job have been committed so far.
+    """
+
+    name = models.CharField(max_length=255, unique=True, help_text="Import job name")
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="import_jobs",
+        help_text="User the todos are imported for",
+    )
+    rows_done = models.PositiveBigIntegerField(
+        default=0, help_text="Input rows committed (valid or skipped)"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True, help_text="Timestamp of the last committed batch"
+    )
+    completed_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the whole input was imported"
+    )
+
+    def __str__(self):
+        return f"{self.name} ({self.rows_done} rows)"
+
+
+class IdempotencyKey(models.Model):
+    """
+    First successful response to a create request sent with an
+    Idempotency-Key header, replayed when the client retries the request.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+        help_text="User who sent the request",
+    )
+    key = models.CharField(max_length=255, help_text="Client-chosen request key")
+    fingerprint = models.CharField(
+        max_length=32, help_text="Hash of the request the key was first used for"
+    )
+    status_code = models.PositiveSmallIntegerField(help_text="Stored HTTP status")
+    response = models.JSONField(help_text="Stored response body")
+    created_at = models.DateTimeField(
+        auto_now_add=True, help_text="Timestamp of the first request"
+    )
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key")
+        ]
+        indexes = [
+            # Backs batched purging of expired keys
+            models.Index(fields=["created_at"], name="idempotency_created_idx"),
+        ]
@@ -0,0 +1,205 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .search import seek_rank
+
+# Ordering key of search results (see core.search.search_todos)
+RANK = "search_rank"
+
+
+class TodoCursorPagination(BasePagination):
+    """
+    Keyset pagination over (<ordering field>, id), newest first by default.
+
+    Each page is fetched with a range condition on the last seen key instead
+    of an OFFSET, so deep pages cost the same as the first one. Composite
+    (user, <field>) indexes on Todo back the scan. ?ordering= picks the
+    field; NULL due dates sort as the smallest value, as SQLite does.
+
+    Search results (?q=) page the same way over (search_rank, id), best
+    match first. Ranks depend on the whole index, so writes between pages
+    can move a todo across the cursor.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    ordering_query_param = "ordering"
+    ordering_fields = ["created_at", "due_date"]
+    default_ordering = "-created_at"
+
+    def get_page_size(self, request):
+        page_size = api_settings.PAGE_SIZE
+        if self.page_size_query_param in request.query_params:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+            except ValueError:
+                pass
+        if not page_size or page_size < 1:
+            return api_settings.PAGE_SIZE
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(
+            self.ordering_query_param, self.default_ordering
+        )
+        if ordering.lstrip("-") not in self.ordering_fields:
+            choices = ", ".join(
+                f"{prefix}{field}"
+                for field in self.ordering_fields
+                for prefix in ("", "-")
+            )
+            raise ValidationError(
+                {self.ordering_query_param: f"Must be one of: {choices}."}
+            )
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        if getattr(view, "ranked", False):
+            # bm25 ranks are lower for better matches, so ascending is best
+            # first; the rank column is selected by search_todos()
+            self.ordering = self.field = RANK
+        else:
+            self.ordering = self.get_ordering(request)
+            self.field = self.ordering.lstrip("-")
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor["reverse"]
+        # Walking backwards flips the direction of the whole ordering
+        descending = self.ordering.startswith("-") != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+
+        if self.cursor is not None:
+            seek = seek_rank if self.field == RANK else self.seek
+            queryset = seek(
+                queryset, self.cursor["value"], self.cursor["id"], descending
+            )
+
+        # Fetch one extra row to learn whether another page follows
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def seek(self, queryset, value, pk, descending):
+        """
+        Keep only rows after (value, pk) in the given direction.
+
+        Written as a range on the field plus a tie-breaker exclusion so
+        SQLite can seek on the composite index rather than scan an OR.
+        NULL is treated as smaller than every value.
+        """
+        field = self.field
+        tie = {f"id__{'gte' if descending else 'lte'}": pk}
+        if value is None:
+            if descending:
+                return queryset.filter(**{f"{field}__isnull": True}).exclude(**tie)
+            return queryset.exclude(**{f"{field}__isnull": True}, **tie)
+
+        if descending:
+            condition = Q(**{f"{field}__lte": value})
+            if queryset.model._meta.get_field(field).null:
+                condition |= Q(**{f"{field}__isnull": True})
+            queryset = queryset.filter(condition)
+        else:
+            queryset = queryset.filter(**{f"{field}__gte": value})
+        return queryset.exclude(**{field: value}, **tie)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            value = data["v"]
+            parse = float if self.field == RANK else parse_datetime
+            cursor = {
+                "value": None if value is None else parse(value),
+                "id": int(data["i"]),
+                "reverse": bool(data.get("r", False)),
+            }
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor is only valid for the ordering it was issued under
+        if data.get("o") != self.ordering or (
+            value is not None and cursor["value"] is None
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, instance, reverse):
+        # Pages hold model instances or values() rows (see core.readers)
+        if isinstance(instance, dict):
+            value, pk = instance[self.field], instance["id"]
+        else:
+            value, pk = getattr(instance, self.field), instance.pk
+        data = {
+            "o": self.ordering,
+            "v": value if value is None or self.field == RANK else value.isoformat(),
+            "i": pk,
+        }
+        if reverse:
+            data["r"] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(data, separators=(",", ":")).encode("ascii")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
@@ -0,0 +1,42 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used instead
+    orjson = None
+
+
+def orjson_default(obj):
+    # Types orjson does not know (Decimal, lazy strings, querysets, ...) go
+    # through DRF's encoder, as they would with the stdlib renderer
+    return JSONRenderer.encoder_class().default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Compact, non-indented output is produced by orjson, which also writes
+    datetime, date, time and UUID values natively (UTC as "Z"). Indented
+    output (e.g. for the browsable API), ASCII-only output and installs
+    without orjson use DRF's stdlib encoder unchanged.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=orjson_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,94 @@
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "core_todo_fts"
+
+# Column weights for bm25(): owner is only used for scoping, and a match in
+# the title counts for more than one in the description
+BM25_WEIGHTS = "0.0, 10.0, 1.0"
+
+
+def fts_available():
+    return connection.vendor == "sqlite"
+
+
+def build_match(query, user_id=None):
+    """
+    Turn free text into an FTS5 MATCH expression: every word must appear
+    as a prefix in the title or description, optionally limited to one
+    user's todos. Returns None when the query has no searchable words.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    phrases = " ".join(f'"{term}"*' for term in terms)
+    match = f"{{title description}}: ({phrases})"
+    if user_id is not None:
+        match = f"owner:u{user_id} AND {match}"
+    return match
+
+
+def _same_rank(queryset):
+    # Matches without a bm25 score (no index, or nothing to search for) all
+    # rank the same, so they still page over (search_rank, id)
+    return queryset.annotate(search_rank=Value(0.0, FloatField()))
+
+
+def search_todos(queryset, query, user=None, ranked=True):
+    """
+    Filter ``queryset`` to todos matching ``query``, best bm25 match first.
+    Passing ``user`` scopes the index lookup to that user's todos.
+
+    With ``ranked=False`` the matches are applied as a plain
+    ``id IN (...)`` filter and no rank is computed, which keeps the
+    queryset usable as a subquery (e.g. by bulk updates).
+    """
+    if not fts_available():
+        terms = re.findall(r"\w+", query)
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) | Q(description__icontains=term)
+            )
+        if not terms:
+            queryset = queryset.none()
+        return _same_rank(queryset) if ranked else queryset
+
+    match = build_match(query, user.pk if user is not None else None)
+    if match is None:
+        queryset = queryset.none()
+        return _same_rank(queryset) if ranked else queryset
+
+    if not ranked:
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        )
+
+    # extra() is the only way to join the virtual table and read bm25()
+    return queryset.extra(
+        tables=[FTS_TABLE],
+        where=[f"{FTS_TABLE}.rowid = core_todo.id", f"{FTS_TABLE} MATCH %s"],
+        params=[match],
+        select={"search_rank": f"bm25({FTS_TABLE}, {BM25_WEIGHTS})"},
+        order_by=["search_rank"],
+    )
+
+
+def seek_rank(queryset, rank, pk, descending=False):
+    """
+    Keep only ranked matches after (rank, pk) in (search_rank, id) order,
+    for paging through search_todos() results.
+    """
+    op = "<" if descending else ">"
+    if not fts_available():
+        return queryset.filter(**{f"id__{'lt' if descending else 'gt'}": pk})
+    # bm25() cannot be filtered through the ORM, so repeat it in the WHERE
+    rank_sql = f"bm25({FTS_TABLE}, {BM25_WEIGHTS})"
+    return queryset.extra(
+        where=[f"({rank_sql} {op} %s OR ({rank_sql} = %s AND core_todo.id {op} %s))"],
+        params=[rank, rank, pk],
+    )
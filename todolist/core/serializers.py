@@ -1,9 +1,18 @@
+from collections import Counter
+
+from django.conf import settings
 from rest_framework import serializers
-from .models import Todo, Tag
+from .cache import bump_todo_version
+from .models import Todo, Tag, TodoStatusCount
+from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.auth.models import User
 
+# Most tags a single todo may carry
+MAX_TAGS = 5
+
 
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,16 +20,115 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+class TagMergeSerializer(serializers.Serializer):
+    """
+    Input for merging (or renaming) tags: every tag in ``sources`` is folded
+    into ``target``.
+    """
+
+    sources = serializers.ListField(
+        child=serializers.CharField(max_length=50), allow_empty=False
+    )
+    target = serializers.CharField(max_length=50)
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    """
+    One step of a batch request: create, update or delete a todo or tag.
+    ``data`` is validated later by the serializer for ``type``.
+    """
+
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    type = serializers.ChoiceField(choices=["todo", "tag"])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "id" not in attrs:
+            raise serializers.ValidationError(
+                {"id": "This field is required for update and delete."}
+            )
+        return attrs
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Input for the batch endpoint. In ``atomic`` mode every operation is
+    undone if one fails; in ``savepoint`` mode each one stands alone.
+    """
+
+    mode = serializers.ChoiceField(choices=["atomic", "savepoint"], default="atomic")
+    operations = BatchOperationSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=getattr(settings, "BATCH_MAX_OPERATIONS", 100),
+    )
+
+
+class TodoListSerializer(serializers.ListSerializer):
+    """
+    Creates many todos at once with a constant number of queries.
+    """
+
+    def create(self, validated_data):
+        default_user = None
+        if "request" in self.context:
+            default_user = self.context["request"].user
+
+        todos = []
+        tag_names = []
+        for attrs in validated_data:
+            user = attrs.pop("user", None) or default_user
+            tags_data = attrs.pop("tags", [])
+            todos.append(Todo(user=user, **attrs))
+            tag_names.append([tag["name"].strip().lower() for tag in tags_data])
+
+        with transaction.atomic():
+            Todo.objects.bulk_create(todos)
+
+            # Resolve every distinct tag name per user in one lookup plus one
+            # insert, then write all through-rows in a single batch
+            tags_by_user = {}
+            for todo, names in zip(todos, tag_names):
+                tags_by_user.setdefault(todo.user, set()).update(names)
+            resolved = {
+                user: Tag.resolve_names(user, names)
+                for user, names in tags_by_user.items()
+            }
+            links = Todo.tags.through.objects.bulk_create(
+                Todo.tags.through(todo_id=todo.pk, tag_id=resolved[todo.user][name].pk)
+                for todo, names in zip(todos, tag_names)
+                for name in names
+            )
+
+            # bulk_create sends no save or m2m signals, so count the new
+            # links and invalidate explicitly
+            Tag.adjust_todo_counts(Counter(link.tag_id for link in links))
+            TodoStatusCount.adjust(Counter((t.user_id, t.status) for t in todos))
+            bump_todo_version(*(user.pk for user in tags_by_user))
+
+        prefetch_related_objects(todos, "tags")
+        return todos
+
+
 class TodoSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, required=False)
     status = serializers.CharField(required=False)  # or other appropriate field type
-    description = serializers.CharField(required=False)  # Make this optional
+    # TextField's max_length is not checked by full_clean(), so enforce it here
+    description = serializers.CharField(required=False, max_length=1000)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sparse fieldsets: keep only the requested fields (see ?fields=)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def validate(self, data):
         errors = {}
 
-        # Check required fields
-        if self.context["request"].method in ["POST"]:
+        # Check required fields when creating (POST, bulk or batch create)
+        if self.instance is None:
             required_fields = ["title"]
             errors = {}
             for field in required_fields:
@@ -29,13 +137,20 @@ class TodoSerializer(serializers.ModelSerializer):
             if errors:
                 raise serializers.ValidationError(errors)
 
+            # Bulk create skips Todo.save(), so run the model's checks
+            # (status choices, title length, clean()) here for every create
+            fields = {name: value for name, value in data.items() if name != "tags"}
+            try:
+                Todo(**fields).full_clean(exclude=["user"])
+            except ValidationError as exc:
+                raise serializers.ValidationError(serializers.as_serializer_error(exc))
+
         if errors:
             raise serializers.ValidationError(errors)
 
         return data
 
     def validate_tags(self, value):
-        MAX_TAGS = 5
         if value and len(value) > MAX_TAGS:
             raise serializers.ValidationError(f"Cannot add more than {MAX_TAGS} tags.")
 
@@ -58,11 +173,13 @@ class TodoSerializer(serializers.ModelSerializer):
             "title",
             "description",
             "created_at",
+            "updated_at",
             "due_date",
             "status",
             "tags",
         ]
-        read_only_fields = ["created_at"]
+        read_only_fields = ["created_at", "updated_at"]
+        list_serializer_class = TodoListSerializer
 
     def create(self, validated_data):
         user = validated_data.pop("user", None)
@@ -75,25 +192,19 @@ class TodoSerializer(serializers.ModelSerializer):
         # Create the todo item
         todo = Todo.objects.create(user=user, **validated_data)
 
-        # Add tags if they exist
+        # Add tags if they exist; a batch request passes its tags resolved
         if tags_data:
-            for tag_data in tags_data:
-                tag, _ = Tag.objects.get_or_create(
-                    name__iexact=tag_data["name"],
-                    user=user,  # Use the todo's user for the tag
-                    defaults={"name": tag_data["name"].strip().lower(), "user": user},
-                )
-                todo.tags.add(tag)
+            todo.set_tags(
+                [tag_data["name"] for tag_data in tags_data],
+                self.context.get("resolved_tags"),
+            )
 
         return todo
 
     def update(self, instance, validated_data):
-        # Pop out 'user' from validated_data if it's present to avoid duplication
-        user = validated_data.pop("user", None)
-
-        # If 'user' is not found in validated_data, get it from the context
-        if not user and "request" in self.context:
-            user = self.context["request"].user
+        # Pop out 'user' from validated_data if it's present; tags always
+        # belong to the todo's owner
+        validated_data.pop("user", None)
 
         tags_data = validated_data.pop("tags", None)
 
@@ -105,14 +216,9 @@ class TodoSerializer(serializers.ModelSerializer):
 
         # Update tags if provided
         if tags_data is not None:
-            instance.tags.clear()
-
-            for tag_data in tags_data:
-                tag, _ = Tag.objects.get_or_create(
-                    name__iexact=tag_data["name"],
-                    user=user,  # Ensure tag is associated with todo's user
-                    defaults={"name": tag_data["name"].strip().lower(), "user": user},
-                )
-                instance.tags.add(tag)
+            instance.set_tags(
+                [tag_data["name"] for tag_data in tags_data],
+                self.context.get("resolved_tags"),
+            )
 
         return instance
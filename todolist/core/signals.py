@@ -0,0 +1,163 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .cache import bump_todo_version, tag_cache
+from .models import Tag, Todo, TodoStatusCount, TodoVersion, Tombstone
+
+
+@receiver(post_delete, sender=Token)
+def evict_revoked_token(sender, instance, **kwargs):
+    # Stop honouring a revoked token in this process straight away
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def evict_user_tokens(sender, instance, created, raw=False, **kwargs):
+    # Cached tokens carry a copy of the user, so a deactivation (or any other
+    # change) takes effect in this process straight away; a new user has no
+    # token yet
+    if created or raw:
+        return
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        token_cache.delete(key)
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_todo_cache(sender, instance, origin=None, **kwargs):
+    # Any change to a user's todos or tags makes their cached lists stale;
+    # a deleted user's version row is already gone with them
+    if _deleting_user(origin):
+        return
+    bump_todo_version(instance.user_id)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def evict_tag_suggestions(sender, instance, **kwargs):
+    # New, renamed or deleted tags must show up in autocomplete at once
+    tag_cache.delete(instance.user_id)
+
+
+def _deleting_user(origin):
+    return isinstance(origin, User) or getattr(origin, "model", None) is User
+
+
+@receiver(post_delete, sender=Todo)
+@receiver(post_delete, sender=Tag)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    # Deleting the user drops their sync history as well, so skip the log
+    if _deleting_user(origin):
+        return
+    Tombstone.objects.create(
+        user_id=instance.user_id,
+        kind=sender._meta.model_name,
+        object_id=instance.pk,
+    )
+
+
+def _uncount(links):
+    # One todo per link, so each linked tag loses exactly one
+    Tag.objects.filter(pk__in=links.values("tag_id")).update(
+        num_todos=F("num_todos") - 1
+    )
+
+
+@receiver(pre_delete, sender=Todo)
+def uncount_deleted_todo(sender, instance, origin=None, **kwargs):
+    # The through-rows go with the todo without an m2m_changed signal. The
+    # user's tags and rollup rows are being deleted too in that case, so
+    # leave them be
+    if _deleting_user(origin):
+        return
+    _uncount(Todo.tags.through.objects.filter(todo_id=instance.pk))
+    TodoStatusCount.adjust({_counted_as(instance): -1})
+
+
+@receiver(post_save, sender=User)
+def seed_status_counts(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        TodoStatusCount.seed(instance.pk)
+        TodoVersion.seed(instance.pk)
+
+
+def _counted_as(todo):
+    # (user_id, status) the rollup currently counts this todo under; loaded
+    # todos carry it from Todo.from_db, others are read back once
+    if not hasattr(todo, "_counted_as"):
+        todo._counted_as = (
+            Todo.objects.filter(pk=todo.pk).values_list("user_id", "status").get()
+        )
+    return todo._counted_as
+
+
+@receiver(pre_save, sender=Todo)
+def remember_counted_status(sender, instance, raw=False, **kwargs):
+    if not raw and not instance._state.adding:
+        _counted_as(instance)
+
+
+@receiver(post_save, sender=Todo)
+def count_todo_status(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    counted_as = (instance.user_id, instance.status)
+    if created:
+        TodoStatusCount.adjust({counted_as: 1})
+    elif instance._counted_as != counted_as:
+        TodoStatusCount.adjust({instance._counted_as: -1, counted_as: 1})
+    instance._counted_as = counted_as
+
+
+@receiver(m2m_changed, sender=Todo.tags.through)
+def count_tag_links(sender, instance, action, reverse, pk_set, **kwargs):
+    # Keep Tag.num_todos in step with the through-table
+    links = Todo.tags.through.objects
+    if action == "post_add":
+        # pk_set holds only the newly linked ids here
+        if reverse:
+            Tag.adjust_todo_counts({instance.pk: len(pk_set)})
+        else:
+            Tag.adjust_todo_counts(dict.fromkeys(pk_set, 1))
+    elif action in ("pre_remove", "pre_clear"):
+        # Removals may name ids that were never linked, so count the rows
+        # actually present before they are deleted
+        if reverse:
+            links = links.filter(tag_id=instance.pk)
+            if action == "pre_remove":
+                links = links.filter(todo_id__in=pk_set)
+            Tag.adjust_todo_counts({instance.pk: -links.count()})
+        else:
+            links = links.filter(todo_id=instance.pk)
+            if action == "pre_remove":
+                links = links.filter(tag_id__in=pk_set)
+            _uncount(links)
+
+
+@receiver(m2m_changed, sender=Todo.tags.through)
+def todo_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    # Tag changes count as todo updates for delta sync. instance is a Todo
+    # or a Tag depending on which side changed; both share the same user
+    now = timezone.now()
+    if not reverse:
+        Todo.objects.filter(pk=instance.pk).update(updated_at=now)
+        instance.updated_at = now
+    elif pk_set:
+        Todo.objects.filter(pk__in=pk_set).update(updated_at=now)
+    bump_todo_version(instance.user_id)
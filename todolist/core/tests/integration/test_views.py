@@ -1,10 +1,30 @@
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 from rest_framework import status
-from core.models import Todo, Tag
+from django.contrib.admin.sites import AdminSite
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from core.admin import TodoAdmin
+from core.bulk import set_status
+from core.cache import tag_cache
+from core.filters import TodoFilterBackend
+from core import idempotency
+from core.models import IdempotencyKey, Todo, Tag, TodoStatusCount, Tombstone
+from core.search import search_todos
+from core.sync import decode_sync_token, encode_sync_token
+import csv
+import gzip
+import io
 import json
+import sys
+import threading
+from unittest import mock
 
 
 class TodoAPITestCase(APITestCase):
@@ -72,7 +92,7 @@ class TodoAPITestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # Should only return todos for the authenticated user
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_update_todo_item(self):
         """
@@ -226,3 +246,1531 @@ class TodoAPITestCase(APITestCase):
         }
         response = self.client.post("/core/api/todos/", data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_query_count_constant_with_tags(self):
+        """
+        Test that listing todos runs a constant number of queries regardless
+        of how many todos (and tags) the user has
+        """
+
+        def add_tagged_todos(count):
+            for i in range(count):
+                todo = Todo.objects.create(title=f"Bulk Todo {i}", user=self.user)
+                todo.tags.add(self.tag)
+
+        add_tagged_todos(2)
+        with self.assertNumQueries(5) as small:
+            response = self.client.get("/core/api/todos/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        add_tagged_todos(20)
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.get("/core/api/todos/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 24)
+        self.assertEqual(
+            response.data["results"][0]["tags"],
+            [{"id": self.tag.id, "name": "personal"}],
+        )
+
+    def test_retrieve_todo_query_count(self):
+        """
+        Test that retrieving a todo loads its tags with a single query
+        """
+        self.todo1.tags.add(self.tag)
+        with self.assertNumQueries(5):
+            response = self.client.get(f"/core/api/todos/{self.todo1.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["tags"]), 1)
+
+
+class TodoPaginationTestCase(APITestCase):
+    """
+    Integration Tests for keyset pagination of the Todo list endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="pageuser", password="pagepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todos = [
+            Todo.objects.create(title=f"Todo {i}", user=self.user) for i in range(7)
+        ]
+        # Newest first, ties broken by id
+        self.expected_ids = [todo.id for todo in reversed(self.todos)]
+
+    def walk(self, url, link):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 3)
+            ids.append([todo["id"] for todo in response.data["results"]])
+            url = response.data[link]
+        return ids
+
+    def test_walk_pages_forward_and_backward(self):
+        """
+        Test that following next and previous links visits every todo once
+        """
+        pages = self.walk("/core/api/todos/?page_size=3", "next")
+        self.assertEqual(sum(pages, []), self.expected_ids)
+        self.assertEqual(len(pages), 3)
+
+        response = self.client.get("/core/api/todos/?page_size=3")
+        last_url = self.client.get(response.data["next"]).data["next"]
+        last_page = self.client.get(last_url)
+        self.assertIsNone(last_page.data["next"])
+        back = self.walk(last_page.data["previous"], "previous")
+        self.assertEqual(back, [self.expected_ids[3:6], self.expected_ids[:3]])
+
+    def test_pagination_with_identical_created_at(self):
+        """
+        Test that the id tie-breaker keeps pages stable when timestamps collide
+        """
+        Todo.objects.filter(user=self.user).update(created_at=timezone.now())
+        pages = self.walk("/core/api/todos/?page_size=2", "next")
+        self.assertEqual(sum(pages, []), sorted(self.expected_ids, reverse=True))
+
+    def test_deep_page_uses_keyset_not_offset(self):
+        """
+        Test that later pages seek on the cursor instead of using OFFSET
+        """
+        response = self.client.get("/core/api/todos/?page_size=3")
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(response.data["next"])
+        todo_queries = [
+            q["sql"] for q in ctx.captured_queries if 'FROM "core_todo"' in q["sql"]
+        ]
+        self.assertEqual(len(todo_queries), 1)
+        self.assertNotIn("OFFSET", todo_queries[0])
+        self.assertIn('"core_todo"."created_at" <=', todo_queries[0])
+
+    def test_invalid_cursor(self):
+        """
+        Test that a malformed cursor is rejected
+        """
+        response = self.client.get("/core/api/todos/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TodoBulkCreateTestCase(APITestCase):
+    """
+    Integration Tests for the bulk create endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="bulkuser", password="bulkpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name="Personal", user=self.user)
+
+    def payload(self, count):
+        return [
+            {
+                "title": f"Imported {i}",
+                "tags": [{"name": "Personal"}, {"name": f"Batch{i % 3}"}],
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_todos_with_tags(self):
+        """
+        Test creating several todos with shared and new tags in one request
+        """
+        response = self.client.post(
+            "/core/api/todos/bulk/", self.payload(4), format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0]["title"], "Imported 0")
+        self.assertEqual(
+            {tag["name"] for tag in response.data[0]["tags"]}, {"personal", "batch0"}
+        )
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 4)
+        # The existing tag is reused and only three new tags are created
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 4)
+        self.assertEqual(self.tag.todos.count(), 4)
+
+    def test_bulk_create_query_count_constant(self):
+        """
+        Test that the number of queries does not grow with the batch size
+        """
+        with CaptureQueriesContext(connection) as small:
+            self.client.post("/core/api/todos/bulk/", self.payload(3), format="json")
+        Tag.objects.exclude(pk=self.tag.pk).delete()
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.post(
+                "/core/api/todos/bulk/", self.payload(30), format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_invalid_item_creates_nothing(self):
+        """
+        Test that one invalid todo rejects the whole batch
+        """
+        data = self.payload(2) + [{"description": "Missing title"}]
+        response = self.client.post("/core/api/todos/bulk/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.data[2])
+        self.assertFalse(Todo.objects.filter(user=self.user).exists())
+
+    def test_bulk_create_runs_model_validation(self):
+        """
+        Test that status choices and field lengths are checked per item
+        """
+        data = self.payload(1) + [
+            {"title": "Bad status", "status": "BOGUS"},
+            {"title": "Too long", "description": "d" * 5000},
+        ]
+        response = self.client.post("/core/api/todos/bulk/", data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("status", response.data[1])
+        self.assertIn("description", response.data[2])
+        self.assertFalse(Todo.objects.filter(user=self.user).exists())
+        self.assertFalse(
+            TodoStatusCount.objects.filter(user=self.user, status="BOGUS").exists()
+        )
+
+    @override_settings(BULK_CREATE_MAX_TODOS=3)
+    def test_bulk_create_size_limit(self):
+        """
+        Test that lists longer than BULK_CREATE_MAX_TODOS are rejected
+        """
+        response = self.client.post(
+            "/core/api/todos/bulk/", self.payload(4), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Todo.objects.filter(user=self.user).exists())
+
+        response = self.client.post(
+            "/core/api/todos/bulk/", self.payload(3), format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_bulk_create_requires_list(self):
+        """
+        Test that a single object is rejected by the bulk endpoint
+        """
+        response = self.client.post(
+            "/core/api/todos/bulk/", {"title": "Not a list"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TodoListCacheTestCase(APITestCase):
+    """
+    Integration Tests for the per-user cached list responses
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_superuser(
+            username="cacheuser", password="cachepassword", email="c@example.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="othercacheuser", password="otherpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(title="Cached Todo", user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_repeated_list_served_from_cache(self):
+        """
+        Test that a repeated list request only reads the data version
+        """
+        first = self.client.get("/core/api/todos/")
+        with self.assertNumQueries(1):
+            second = self.client.get("/core/api/todos/")
+        self.assertEqual(first.data, second.data)
+
+    def test_api_writes_invalidate_cache(self):
+        """
+        Test that creates, updates, tag changes and deletes are visible at once
+        """
+        self.client.get("/core/api/todos/")
+        self.client.post("/core/api/todos/", {"title": "Fresh"}, format="json")
+        titles = [
+            t["title"] for t in self.client.get("/core/api/todos/").data["results"]
+        ]
+        self.assertIn("Fresh", titles)
+
+        self.client.patch(
+            f"/core/api/todos/{self.todo.id}/",
+            {"tags": [{"name": "Home"}]},
+            format="json",
+        )
+        results = self.client.get("/core/api/todos/").data["results"]
+        cached = next(t for t in results if t["id"] == self.todo.id)
+        self.assertEqual([tag["name"] for tag in cached["tags"]], ["home"])
+
+        self.client.delete(f"/core/api/todos/{self.todo.id}/")
+        results = self.client.get("/core/api/todos/").data["results"]
+        self.assertNotIn(self.todo.id, [t["id"] for t in results])
+
+        self.client.post("/core/api/todos/bulk/", [{"title": "Bulk"}], format="json")
+        results = self.client.get("/core/api/todos/").data["results"]
+        self.assertIn("Bulk", [t["title"] for t in results])
+
+    def test_admin_save_invalidates_cache(self):
+        """
+        Test that saving a todo through the admin invalidates the list cache
+        """
+        self.client.get("/core/api/todos/")
+        request = RequestFactory().post("/admin/core/todo/")
+        request.user = self.user
+        self.todo.title = "Edited In Admin"
+        TodoAdmin(Todo, AdminSite()).save_model(request, self.todo, None, change=True)
+
+        results = self.client.get("/core/api/todos/").data["results"]
+        self.assertEqual(results[0]["title"], "Edited In Admin")
+
+    def test_writes_from_another_process_invalidate_cache(self):
+        """
+        Test that a write made with a different cache (as a management
+        command or another worker would) is not hidden by this cache
+        """
+        first = self.client.get("/core/api/todos/")
+        other_process_cache = LocMemCache("other-process", {})
+        with mock.patch("core.cache.cache", other_process_cache):
+            set_status(Todo.objects.filter(pk=self.todo.pk), "COMPLETED")
+
+        second = self.client.get("/core/api/todos/")
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.data["results"][0]["status"], "COMPLETED")
+
+    def test_cache_is_per_user(self):
+        """
+        Test that one user's cached list is never served to another
+        """
+        self.client.get("/core/api/todos/")
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get("/core/api/todos/")
+        self.assertEqual(response.data["results"], [])
+
+        # Another user's writes leave this user's cache untouched
+        Todo.objects.create(title="Other", user=self.other_user)
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(1):
+            self.client.get("/core/api/todos/")
+
+
+class TodoConditionalGetTestCase(APITestCase):
+    """
+    Integration Tests for ETag / If-None-Match handling
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="etaguser", password="etagpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(title="Tagged Todo", user=self.user)
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_list_returns_304_when_unchanged(self):
+        """
+        Test that a matching If-None-Match on the list only reads the version
+        """
+        response = self.client.get("/core/api/todos/")
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/core/api/todos/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_retrieve_returns_304_when_unchanged(self):
+        """
+        Test that a matching If-None-Match on a detail view returns 304
+        """
+        url = f"/core/api/todos/{self.todo.id}/"
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=f"W/{etag}")
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_wildcard_needs_existing_todo(self):
+        """
+        Test that If-None-Match: * only answers 304 for the user's own todo
+        """
+        other = User.objects.create_user(username="other", password="otherpassword")
+        foreign = Todo.objects.create(title="Foreign", user=other)
+        for pk in (999999, foreign.pk):
+            response = self.client.get(f"/core/api/todos/{pk}/", HTTP_IF_NONE_MATCH="*")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(
+            f"/core/api/todos/{self.todo.id}/", HTTP_IF_NONE_MATCH="*"
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_write(self):
+        """
+        Test that any write to the user's todos changes the ETag
+        """
+        etag = self.client.get("/core/api/todos/")["ETag"]
+        self.client.patch(
+            f"/core/api/todos/{self.todo.id}/", {"status": "WORKING"}, format="json"
+        )
+        response = self.client.get("/core/api/todos/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["status"], "WORKING")
+
+    def test_etag_differs_per_page(self):
+        """
+        Test that different query strings get different ETags
+        """
+        first = self.client.get("/core/api/todos/")["ETag"]
+        other = self.client.get("/core/api/todos/?page_size=1")["ETag"]
+        self.assertNotEqual(first, other)
+
+    def test_updated_at_advances_on_save(self):
+        """
+        Test that updated_at is set on create and moves forward on save
+        """
+        created = self.todo.updated_at
+        self.assertIsNotNone(created)
+        self.todo.title = "Renamed"
+        self.todo.save()
+        self.assertGreater(self.todo.updated_at, created)
+
+
+class TodoSyncTestCase(APITestCase):
+    """
+    Integration Tests for the delta sync endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="syncuser", password="syncpassword"
+        )
+        self.other_user = User.objects.create_user(
+            username="othersyncuser", password="otherpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo1 = Todo.objects.create(title="Sync One", user=self.user)
+        self.todo2 = Todo.objects.create(title="Sync Two", user=self.user)
+        Todo.objects.create(title="Not Mine", user=self.other_user)
+
+    def sync(self, token=None):
+        url = "/core/api/todos/changes/"
+        if token:
+            url += f"?since={token}"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_sync_without_token(self):
+        """
+        Test that the first sync returns every todo and a token
+        """
+        data = self.sync()
+        self.assertEqual(
+            {todo["id"] for todo in data["todos"]}, {self.todo1.id, self.todo2.id}
+        )
+        self.assertEqual(data["deleted"], {"todos": [], "tags": []})
+        self.assertTrue(data["next"])
+
+    @override_settings(SYNC_SAFETY_WINDOW_SECONDS=0)
+    def test_incremental_sync_returns_only_changes(self):
+        """
+        Test that updates, tag changes and deletions after the token are returned
+        """
+        token = self.sync()["next"]
+        self.assertEqual(self.sync(token)["todos"], [])
+
+        self.client.patch(
+            f"/core/api/todos/{self.todo1.id}/", {"title": "Changed"}, format="json"
+        )
+        self.todo2.set_tags(["home"])
+        data = self.sync(token)
+        self.assertEqual(
+            [todo["id"] for todo in data["todos"]], [self.todo1.id, self.todo2.id]
+        )
+        self.assertEqual([tag["name"] for tag in data["tags"]], ["home"])
+
+        token = data["next"]
+        self.client.delete(f"/core/api/todos/{self.todo1.id}/")
+        Tag.objects.get(name="home").delete()
+        data = self.sync(token)
+        self.assertEqual(data["todos"], [])
+        self.assertEqual(data["deleted"]["todos"], [self.todo1.id])
+        self.assertEqual(len(data["deleted"]["tags"]), 1)
+
+        # Nothing new since the last token
+        data = self.sync(data["next"])
+        self.assertEqual(data["deleted"], {"todos": [], "tags": []})
+
+    def test_sync_returns_changes_committed_late(self):
+        """
+        Test that a change stamped before the token but committed after it
+        is returned by the next sync, and repeats are limited to the window
+        """
+        token = self.sync()["next"]
+        # Stamped just before the token was issued, visible only now
+        Todo.objects.filter(pk=self.todo1.pk).update(
+            updated_at=decode_sync_token(token) - timedelta(seconds=1)
+        )
+        Todo.objects.filter(pk=self.todo2.pk).update(
+            updated_at=decode_sync_token(token) - timedelta(minutes=1)
+        )
+        data = self.sync(token)
+        self.assertEqual([todo["id"] for todo in data["todos"]], [self.todo1.id])
+
+    def test_sync_queries_use_indexes(self):
+        """
+        Test that change queries seek on the (user, timestamp) indexes
+        """
+        since = timezone.now()
+        plans = {
+            "todo_user_updated_idx": Todo.objects.filter(
+                user=self.user, updated_at__gt=since
+            ).explain(),
+            "tag_user_updated_idx": Tag.objects.filter(
+                user=self.user, updated_at__gt=since
+            ).explain(),
+            "tombstone_user_idx": Tombstone.objects.filter(
+                user=self.user, deleted_at__gt=since
+            ).explain(),
+        }
+        for index, plan in plans.items():
+            self.assertIn(f"USING INDEX {index}", plan)
+
+    def test_invalid_and_expired_tokens(self):
+        """
+        Test that garbage tokens are rejected and stale tokens force a resync
+        """
+        response = self.client.get("/core/api/todos/changes/?since=garbage")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        expired = encode_sync_token(timezone.now() - timedelta(days=365))
+        response = self.client.get(f"/core/api/todos/changes/?since={expired}")
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_deleting_user_leaves_no_tombstones(self):
+        """
+        Test that cascading a user delete does not log tombstones
+        """
+        self.other_user.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class TodoExportTestCase(APITestCase):
+    """
+    Integration Tests for the streaming export endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="exportuser", password="exportpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todos = []
+        for i in range(5):
+            todo = Todo.objects.create(
+                title=f"Export {i}", description="Line, with comma", user=self.user
+            )
+            todo.set_tags(["work", f"t{i}"])
+            self.todos.append(todo)
+        Todo.objects.create(
+            title="Hidden",
+            user=User.objects.create_user(username="hidden", password="hidden"),
+        )
+
+    def test_export_ndjson(self):
+        """
+        Test that the default export streams one JSON object per line
+        """
+        response = self.client.get("/core/api/todos/export/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual([row["id"] for row in rows], [t.id for t in self.todos[::-1]])
+        self.assertEqual(sorted(rows[0]["tags"]), ["t4", "work"])
+        api_row = self.client.get(f"/core/api/todos/{self.todos[4].id}/").data
+        self.assertEqual(rows[0]["created_at"], api_row["created_at"])
+
+    def test_export_csv(self):
+        """
+        Test that ?type=csv streams a header and one row per todo
+        """
+        response = self.client.get("/core/api/todos/export/?type=csv")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["title"], "Export 4")
+        self.assertEqual(rows[0]["description"], "Line, with comma")
+        self.assertEqual(sorted(rows[0]["tags"].split(",")), ["t4", "work"])
+
+    def test_export_prefetches_tags_per_chunk(self):
+        """
+        Test that tags are loaded once per chunk, not once per todo
+        """
+        with mock.patch("core.export.EXPORT_CHUNK_SIZE", 2):
+            response = self.client.get("/core/api/todos/export/")
+            with CaptureQueriesContext(connection) as ctx:
+                b"".join(response.streaming_content)
+        tag_queries = [q for q in ctx.captured_queries if 'FROM "core_tag"' in q["sql"]]
+        # 5 todos in chunks of 2 -> 3 tag queries
+        self.assertEqual(len(tag_queries), 3)
+
+    def test_export_invalid_type(self):
+        """
+        Test that an unknown export type is rejected
+        """
+        response = self.client.get("/core/api/todos/export/?type=xml")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TodoSearchTestCase(APITestCase):
+    """
+    Integration Tests for full-text search on the Todo list endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="searchuser", password="searchpassword", email="s@example.com"
+        )
+        self.other_user = User.objects.create_user(
+            username="othersearchuser", password="otherpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.in_description = Todo.objects.create(
+            title="Weekly chores", description="Buy milk and eggs", user=self.user
+        )
+        self.in_title = Todo.objects.create(
+            title="Milk delivery", description="Call the dairy", user=self.user
+        )
+        Todo.objects.create(title="Unrelated", description="Nothing", user=self.user)
+        Todo.objects.create(title="Milk for someone else", user=self.other_user)
+
+    def search(self, query):
+        response = self.client.get("/core/api/todos/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [todo["id"] for todo in response.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        """
+        Test that results are scoped to the user and ranked by bm25
+        """
+        self.assertEqual(
+            self.search("milk"), [self.in_title.id, self.in_description.id]
+        )
+
+    def test_search_prefix_and_multiple_terms(self):
+        """
+        Test that every word must match, as a prefix
+        """
+        self.assertEqual(self.search("mil egg"), [self.in_description.id])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_search_results_page_by_rank(self):
+        """
+        Test that ranked results can be paged forwards and back, including
+        across todos with the same rank
+        """
+        for i in range(3):
+            Todo.objects.create(title=f"Milk run {i}", user=self.user)
+        everything = self.search("milk")
+        self.assertEqual(len(everything), 5)
+
+        pages = []
+        response = self.client.get("/core/api/todos/", {"q": "milk", "page_size": 2})
+        while True:
+            pages.append([todo["id"] for todo in response.data["results"]])
+            if response.data["next"] is None:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), everything)
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([todo["id"] for todo in response.data["results"]], pages[1])
+
+    def test_search_index_follows_writes(self):
+        """
+        Test that the triggers keep the index in sync with updates and deletes
+        """
+        self.client.patch(
+            f"/core/api/todos/{self.in_title.id}/", {"title": "Cheese"}, format="json"
+        )
+        self.assertEqual(self.search("milk"), [self.in_description.id])
+        self.assertEqual(self.search("cheese"), [self.in_title.id])
+
+        self.client.delete(f"/core/api/todos/{self.in_description.id}/")
+        self.assertEqual(self.search("milk"), [])
+
+        self.client.post(
+            "/core/api/todos/bulk/", [{"title": "Bulk milk"}], format="json"
+        )
+        self.assertEqual(len(self.search("milk")), 1)
+
+    def test_search_uses_fts_index(self):
+        """
+        Test that the query is driven by the FTS5 virtual table
+        """
+        queryset = search_todos(Todo.objects.filter(user=self.user), "milk", self.user)
+        plan = queryset.explain()
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertIn("SEARCH core_todo USING INTEGER PRIMARY KEY", plan)
+
+    def test_admin_search_uses_full_text(self):
+        """
+        Test that the admin changelist search finds todos through the index
+        """
+        self.client.force_login(self.user)
+        response = self.client.get("/admin/core/todo/", {"q": "dairy"})
+        self.assertContains(response, "Milk delivery")
+        self.assertNotContains(response, "Weekly chores")
+
+
+class TodoFilterTestCase(APITestCase):
+    """
+    Integration Tests for server-side filtering and ordering
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="filteruser", password="filterpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        now = timezone.now()
+        self.soon = Todo.objects.create(
+            title="Soon", due_date=now + timedelta(days=1), user=self.user
+        )
+        self.later = Todo.objects.create(
+            title="Later",
+            status="WORKING",
+            due_date=now + timedelta(days=10),
+            user=self.user,
+        )
+        self.undated = Todo.objects.create(
+            title="Undated", status="COMPLETED", user=self.user
+        )
+        self.soon.set_tags(["Work"])
+        self.undated.set_tags(["work", "home"])
+        other = User.objects.create_user(username="otherfilter", password="x")
+        Todo.objects.create(title="Other", user=other).set_tags(["work"])
+
+    def titles(self, params):
+        response = self.client.get("/core/api/todos/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [todo["title"] for todo in response.data["results"]]
+
+    def test_filter_by_status(self):
+        """
+        Test filtering by one or several statuses
+        """
+        self.assertEqual(self.titles({"status": "WORKING"}), ["Later"])
+        self.assertEqual(self.titles({"status": "open,completed"}), ["Undated", "Soon"])
+        response = self.client.get("/core/api/todos/", {"status": "DONE"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_by_due_range(self):
+        """
+        Test filtering by due_after and due_before
+        """
+        middle = (timezone.now() + timedelta(days=5)).isoformat()
+        self.assertEqual(self.titles({"due_before": middle}), ["Soon"])
+        self.assertEqual(self.titles({"due_after": middle}), ["Later"])
+        self.assertEqual(
+            self.titles({"due_after": timezone.now().date().isoformat()}),
+            ["Later", "Soon"],
+        )
+        response = self.client.get("/core/api/todos/", {"due_after": "soon"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_by_tag_case_insensitive(self):
+        """
+        Test filtering by tag name regardless of case
+        """
+        self.assertEqual(self.titles({"tag": "WORK"}), ["Undated", "Soon"])
+        self.assertEqual(
+            self.titles({"tag": "home", "status": "COMPLETED"}), ["Undated"]
+        )
+        self.assertEqual(self.titles({"tag": "missing"}), [])
+
+    def test_ordering_by_due_date_paginates(self):
+        """
+        Test ordering by due date in both directions across pages
+        """
+        self.assertEqual(
+            self.titles({"ordering": "due_date"}), ["Undated", "Soon", "Later"]
+        )
+
+        pages = []
+        url = "/core/api/todos/?ordering=-due_date&page_size=1"
+        while url:
+            response = self.client.get(url)
+            pages += [todo["title"] for todo in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(pages, ["Later", "Soon", "Undated"])
+
+        # And back again from the last page
+        back = []
+        url = response.data["previous"]
+        while url:
+            response = self.client.get(url)
+            back += [todo["title"] for todo in response.data["results"]]
+            url = response.data["previous"]
+        self.assertEqual(back, ["Soon", "Later"])
+
+    def test_invalid_ordering(self):
+        """
+        Test that unsupported ordering fields and mismatched cursors are rejected
+        """
+        response = self.client.get("/core/api/todos/", {"ordering": "title"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        next_url = self.client.get("/core/api/todos/?page_size=1").data["next"]
+        response = self.client.get(next_url + "&ordering=due_date")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filters_use_indexes(self):
+        """
+        Test that every supported filter is answered from an index
+        """
+        base = Todo.objects.filter(user=self.user)
+
+        def plan(params, ordering=("-created_at", "-id")):
+            request = mock.Mock(user=self.user, query_params=params)
+            queryset = TodoFilterBackend().filter_queryset(request, base, None)
+            return queryset.order_by(*ordering).explain()
+
+        status_plan = plan({"status": "OPEN"})
+        self.assertIn(
+            "USING INDEX todo_user_status_idx (user_id=? AND status=?)", status_plan
+        )
+        self.assertNotIn("TEMP B-TREE", status_plan)
+
+        due_plan = plan({"due_after": "2030-01-01"}, ordering=("due_date", "id"))
+        self.assertIn(
+            "USING INDEX todo_user_due_idx (user_id=? AND due_date>?)", due_plan
+        )
+
+        tag_plan = plan({"tag": "work"})
+        self.assertIn("USING COVERING INDEX core_todo_tags_tag_todo_idx", tag_plan)
+        self.assertIn("unique_lowercase_tag_name_per_user", tag_plan)
+        for query_plan in (status_plan, due_plan, tag_plan):
+            self.assertNotIn("SCAN core_todo\n", query_plan + "\n")
+
+
+class TodoStatsTestCase(APITestCase):
+    """
+    Integration Tests for the dashboard stats endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="statsuser", password="statspassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        Todo.objects.create(title="Open", user=self.user).set_tags(["work", "home"])
+        Todo.objects.create(title="Working", status="WORKING", user=self.user)
+        done = Todo.objects.create(title="Done", user=self.user)
+        done.set_tags(["work"])
+        done.status = "COMPLETED"
+        done.save()
+        other = User.objects.create_user(username="otherstats", password="x")
+        Todo.objects.create(title="Other", user=other).set_tags(["work"])
+
+    def test_stats_counts(self):
+        """
+        Test that stats report status and tag counts for the user only
+        """
+        response = self.client.get("/core/api/todos/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 3)
+        self.assertEqual(
+            response.data["by_status"],
+            {
+                "OPEN": 1,
+                "WORKING": 1,
+                "PENDING_REVIEW": 0,
+                "COMPLETED": 1,
+                "OVERDUE": 0,
+                "CANCELLED": 0,
+            },
+        )
+        self.assertEqual(response.data["overdue"], 0)
+        self.assertEqual(
+            [(tag["name"], tag["count"]) for tag in response.data["tags"]],
+            [("work", 2), ("home", 1)],
+        )
+
+    def test_stats_follow_writes(self):
+        """
+        Test that creating and deleting through the API updates the stats
+        """
+        self.client.post(
+            "/core/api/todos/", {"title": "New", "status": "OVERDUE"}, format="json"
+        )
+        Todo.objects.get(title="Open").delete()
+
+        response = self.client.get("/core/api/todos/stats/")
+        self.assertEqual(response.data["by_status"]["OPEN"], 0)
+        self.assertEqual(response.data["overdue"], 1)
+        self.assertEqual(
+            [(tag["name"], tag["count"]) for tag in response.data["tags"]],
+            [("work", 1)],
+        )
+
+    def test_stats_query_count_constant(self):
+        """
+        Test that stats cost the same number of queries for any number of todos
+        """
+        with CaptureQueriesContext(connection) as small:
+            self.client.get("/core/api/todos/stats/")
+        for i in range(20):
+            Todo.objects.create(title=f"More {i}", user=self.user)
+        with self.assertNumQueries(len(small.captured_queries)):
+            response = self.client.get("/core/api/todos/stats/")
+        self.assertEqual(response.data["total"], 23)
+
+    def test_stats_requires_authentication(self):
+        """
+        Test that anonymous requests are rejected
+        """
+        self.client.force_authenticate(user=None)
+        response = self.client.get("/core/api/todos/stats/")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class TagAutocompleteTestCase(APITestCase):
+    """
+    Integration Tests for tag autocomplete
+    """
+
+    def setUp(self):
+        tag_cache.clear()
+        self.user = User.objects.create_user(username="taguser", password="tagpassword")
+        self.client.force_authenticate(user=self.user)
+        for i, names in enumerate([["work", "workout"], ["work", "wood"], ["home"]]):
+            Todo.objects.create(title=f"Todo {i}", user=self.user).set_tags(names)
+        Tag.objects.create(name="Worry", user=self.user)
+        other = User.objects.create_user(username="othertags", password="x")
+        Tag.objects.create(name="world", user=other)
+
+    def tearDown(self):
+        tag_cache.clear()
+
+    def names(self, params):
+        response = self.client.get("/core/api/tags/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tag["name"] for tag in response.data]
+
+    def test_prefix_ordered_by_usage(self):
+        """
+        Test that matching tags come back most used first, then by name
+        """
+        self.assertEqual(
+            self.names({"prefix": "WO"}), ["work", "wood", "workout", "worry"]
+        )
+        self.assertEqual(self.names({"prefix": "work"}), ["work", "workout"])
+        self.assertEqual(self.names({"prefix": "x"}), [])
+        response = self.client.get("/core/api/tags/", {"prefix": "h"})
+        self.assertEqual(
+            response.data,
+            [{"id": Tag.objects.get(name="home").id, "name": "home", "count": 1}],
+        )
+
+    def test_limit(self):
+        """
+        Test that ?limit= caps the suggestions and bad values fall back
+        """
+        self.assertEqual(self.names({"prefix": "w", "limit": "2"}), ["work", "wood"])
+        self.assertEqual(len(self.names({"limit": "nope"})), 5)
+
+    def test_cached_until_tags_change(self):
+        """
+        Test that repeated lookups skip the database until a tag is created
+        """
+        self.names({"prefix": "w"})
+        with self.assertNumQueries(0):
+            self.names({"prefix": "wo"})
+
+        Todo.objects.get(title="Todo 2").set_tags(["home", "wok"])
+        self.assertIn("wok", self.names({"prefix": "wo"}))
+        Tag.objects.get(name="worry").delete()
+        self.assertNotIn("worry", self.names({"prefix": "wo"}))
+
+    def test_prefix_ending_in_last_code_point(self):
+        """
+        Test that a prefix ending in U+10FFFF is answered, not a 500
+        """
+        last = chr(sys.maxunicode)
+        Tag.objects.create(name=f"w{last}x", user=self.user)
+        Tag.objects.create(name=last, user=self.user)
+        with mock.patch("core.autocomplete.MAX_CACHED_TAGS", 2):
+            self.assertEqual(self.names({"prefix": f"w{last}"}), [f"w{last}x"])
+            self.assertEqual(self.names({"prefix": last}), [last])
+        tag_cache.clear()
+        self.assertEqual(self.names({"prefix": f"w{last}"}), [f"w{last}x"])
+
+    def test_no_tags_is_cached(self):
+        """
+        Test that an empty tag list is cached like any other
+        """
+        user = User.objects.create_user(username="notags", password="x")
+        self.client.force_authenticate(user=user)
+        self.assertEqual(self.names({"prefix": "w"}), [])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names({"prefix": "h"}), [])
+
+    def test_large_tag_sets_use_the_index(self):
+        """
+        Test that users with too many tags to cache are answered by a query
+        """
+        with mock.patch("core.autocomplete.MAX_CACHED_TAGS", 2):
+            self.assertEqual(
+                self.names({"prefix": "wo"}), ["work", "wood", "workout", "worry"]
+            )
+            with self.assertNumQueries(1):
+                self.assertEqual(self.names({"prefix": "h"}), ["home"])
+
+
+class TagMergeTestCase(APITestCase):
+    """
+    Integration Tests for merging and renaming tags
+    """
+
+    def setUp(self):
+        tag_cache.clear()
+        self.user = User.objects.create_user(
+            username="mergeuser", password="mergepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(title="Todo", user=self.user)
+        self.todo.set_tags(["work", "work-items"])
+        Todo.objects.create(title="Other", user=self.user).set_tags(["work-items"])
+
+    def tearDown(self):
+        tag_cache.clear()
+
+    def test_merge_tags(self):
+        """
+        Test merging tags through the API
+        """
+        self.client.get("/core/api/tags/", {"prefix": "w"})
+        response = self.client.post(
+            "/core/api/tags/merge/",
+            {"sources": ["Work-Items"], "target": "work"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "work")
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["todos_changed"], 2)
+
+        # Autocomplete no longer offers the merged-away tag
+        response = self.client.get("/core/api/tags/", {"prefix": "w"})
+        self.assertEqual([tag["name"] for tag in response.data], ["work"])
+
+    def test_merge_validation(self):
+        """
+        Test that bad input and unknown tags are rejected with 400
+        """
+        for payload in (
+            {"sources": [], "target": "work"},
+            {"sources": ["work-items"]},
+            {"sources": ["missing"], "target": "work"},
+        ):
+            response = self.client.post("/core/api/tags/merge/", payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+
+class TodoIdempotencyTestCase(APITestCase):
+    """
+    Integration Tests for Idempotency-Key handling on create
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="retryuser", password="retrypassword"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, url, data, key="key-1"):
+        return self.client.post(url, data, format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        """
+        Test that a retry returns the stored response without creating again
+        """
+        first = self.post("/core/api/todos/", {"title": "Once"})
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        # Only the stored response is read: no validation, no inserts
+        with self.assertNumQueries(1):
+            retry = self.post("/core/api/todos/", {"title": "Once"})
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 1)
+
+    def test_bulk_create_is_idempotent(self):
+        """
+        Test that bulk create accepts the header too
+        """
+        payload = [{"title": "A"}, {"title": "B"}]
+        first = self.post("/core/api/todos/bulk/", payload)
+        retry = self.post("/core/api/todos/bulk/", payload)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 2)
+
+    def test_key_reused_for_different_request(self):
+        """
+        Test that reusing a key with another body is rejected with 422
+        """
+        self.post("/core/api/todos/", {"title": "Once"})
+        response = self.post("/core/api/todos/", {"title": "Other"})
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 1)
+
+    def test_keys_are_per_user_and_failures_are_not_stored(self):
+        """
+        Test that keys are scoped per user and a failed request can be retried
+        """
+        response = self.post("/core/api/todos/", {"title": ""})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.post("/core/api/todos/", {"title": "Fixed"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        other = User.objects.create_user(username="otherretry", password="x")
+        self.client.force_authenticate(user=other)
+        response = self.post("/core/api/todos/", {"title": "Fixed"})
+        self.assertNotIn("Idempotent-Replayed", response)
+        self.assertEqual(Todo.objects.filter(user=other).count(), 1)
+
+    def test_invalid_key(self):
+        """
+        Test that an over-long key is rejected
+        """
+        response = self.post("/core/api/todos/", {"title": "Once"}, key="k" * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Todo.objects.exists())
+
+    def test_expired_keys_run_again_and_are_purged(self):
+        """
+        Test that keys past their TTL are ignored and removed by the purge command
+        """
+        self.post("/core/api/todos/", {"title": "Once"})
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        self.post("/core/api/todos/", {"title": "Once"})
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 2)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=2))
+        out = io.StringIO()
+        call_command("purge_idempotency_keys", stdout=out)
+        self.assertIn("Purged 1 idempotency key(s).", out.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_concurrent_duplicate_is_rolled_back(self):
+        """
+        Test that losing a race on the same key undoes the insert and replays
+        """
+        first = self.post("/core/api/todos/", {"title": "Once"})
+        real_replay = idempotency.replay
+        calls = []
+
+        def miss_first_lookup(*args):
+            # Pretend the stored key was written after this request looked
+            calls.append(args)
+            return None if len(calls) == 1 else real_replay(*args)
+
+        with mock.patch.object(idempotency, "replay", side_effect=miss_first_lookup):
+            retry = self.post("/core/api/todos/", {"title": "Once"})
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 1)
+
+
+class BatchTestCase(APITestCase):
+    """
+    Integration Tests for the batch operations endpoint
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="batchuser", password="batchpassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(user=self.user, title="Existing")
+        self.todo.set_tags(["home"])
+
+    def batch(self, operations, mode="atomic"):
+        return self.client.post(
+            "/core/api/batch/",
+            {"mode": mode, "operations": operations},
+            format="json",
+        )
+
+    def test_operations_apply_in_order(self):
+        """
+        Test that creates, updates and deletes all apply with per-op results
+        """
+        other = Todo.objects.create(user=self.user, title="Doomed")
+        response = self.batch(
+            [
+                {"op": "create", "type": "todo", "data": {"title": "New"}},
+                {
+                    "op": "update",
+                    "type": "todo",
+                    "id": self.todo.pk,
+                    "data": {"status": "COMPLETED", "tags": [{"name": "Work"}]},
+                },
+                {"op": "delete", "type": "todo", "id": other.pk},
+                {"op": "create", "type": "tag", "data": {"name": "Later"}},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [201, 200, 204, 201])
+        self.assertEqual(results[0]["data"]["title"], "New")
+        self.assertEqual(results[1]["data"]["tags"][0]["name"], "work")
+        self.assertEqual(results[3]["data"]["name"], "later")
+
+        self.todo.refresh_from_db()
+        self.assertEqual(self.todo.status, "COMPLETED")
+        self.assertFalse(Todo.objects.filter(pk=other.pk).exists())
+        self.assertEqual(Tag.objects.get(user=self.user, name="work").num_todos, 1)
+        self.assertEqual(Tag.objects.get(user=self.user, name="home").num_todos, 0)
+        self.assertTrue(Tombstone.objects.filter(object_id=other.pk).exists())
+
+    def test_tag_changes_show_in_later_todo_results(self):
+        """
+        Test that a todo result reflects tags renamed or deleted earlier
+        in the same batch
+        """
+        self.todo.set_tags(["home", "work"])
+        home = Tag.objects.get(user=self.user, name="home")
+        work = Tag.objects.get(user=self.user, name="work")
+        response = self.batch(
+            [
+                {"op": "delete", "type": "tag", "id": work.pk},
+                {
+                    "op": "update",
+                    "type": "tag",
+                    "id": home.pk,
+                    "data": {"name": "House"},
+                },
+                {"op": "update", "type": "todo", "id": self.todo.pk, "data": {}},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.json()["results"][2]["data"]
+        self.assertEqual([tag["name"] for tag in result["tags"]], ["house"])
+
+    def test_tags_resolved_once(self):
+        """
+        Test that the batch's tag names are looked up in a single query
+        """
+        operations = [
+            {
+                "op": "create",
+                "type": "todo",
+                "data": {"title": f"T{i}", "tags": [{"name": "shared"}]},
+            }
+            for i in range(5)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.batch(operations)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lookups = [
+            q for q in queries if 'FROM "core_tag"' in q["sql"] and "LOWER" in q["sql"]
+        ]
+        self.assertEqual(len(lookups), 1)
+        self.assertEqual(Tag.objects.get(user=self.user, name="shared").num_todos, 5)
+
+    def test_atomic_failure_rolls_back(self):
+        """
+        Test that one invalid operation stops the whole atomic batch
+        """
+        response = self.batch(
+            [
+                {"op": "create", "type": "todo", "data": {"title": "Kept?"}},
+                {"op": "create", "type": "todo", "data": {"description": "x"}},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["status"], 424)
+        self.assertEqual(results[1]["status"], 400)
+        self.assertIn("title", results[1]["errors"])
+        self.assertEqual(Todo.objects.filter(user=self.user).count(), 1)
+
+    def test_atomic_execution_failure_rolls_back(self):
+        """
+        Test that a failure while writing undoes earlier operations
+        """
+        response = self.batch(
+            [
+                {"op": "create", "type": "todo", "data": {"title": "Gone"}},
+                {"op": "delete", "type": "todo", "id": self.todo.pk},
+                {"op": "delete", "type": "todo", "id": self.todo.pk},
+            ]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        statuses = [r["status"] for r in response.json()["results"]]
+        self.assertEqual(statuses, [424, 424, 404])
+        self.assertEqual(
+            list(Todo.objects.filter(user=self.user).values_list("title", flat=True)),
+            ["Existing"],
+        )
+
+    def test_savepoint_mode_keeps_successes(self):
+        """
+        Test that savepoint mode applies the operations that succeed
+        """
+        Tag.objects.create(user=self.user, name="taken")
+        response = self.batch(
+            [
+                {"op": "create", "type": "todo", "data": {"title": "Kept"}},
+                {"op": "create", "type": "tag", "data": {"name": "Taken"}},
+                {"op": "update", "type": "todo", "id": 999999, "data": {}},
+            ],
+            mode="savepoint",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        statuses = [r["status"] for r in response.json()["results"]]
+        self.assertEqual(statuses, [201, 400, 404])
+        self.assertTrue(Todo.objects.filter(user=self.user, title="Kept").exists())
+
+    def test_other_users_objects_not_found(self):
+        """
+        Test that operations cannot reach another user's todos
+        """
+        other = User.objects.create_user(username="other", password="otherpassword")
+        todo = Todo.objects.create(user=other, title="Private")
+        response = self.batch([{"op": "delete", "type": "todo", "id": todo.pk}])
+        self.assertEqual(response.json()["results"][0]["status"], 404)
+        self.assertTrue(Todo.objects.filter(pk=todo.pk).exists())
+
+    def test_invalid_envelope(self):
+        """
+        Test that a malformed request is rejected before any operation runs
+        """
+        response = self.batch([{"op": "update", "type": "todo"}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("operations", response.json())
+        response = self.batch([], mode="atomic")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TodoSparseFieldsTestCase(APITestCase):
+    """
+    Integration Tests for ?fields= sparse fieldsets
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="sparseuser", password="sparsepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        for i in range(3):
+            todo = Todo.objects.create(
+                user=self.user, title=f"Todo {i}", description="x" * 500
+            )
+            todo.set_tags([f"tag{i}"])
+
+    def test_list_returns_requested_fields(self):
+        """
+        Test that only the requested fields are serialized
+        """
+        response = self.client.get("/core/api/todos/?fields=id,title,status")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for item in response.json()["results"]:
+            self.assertEqual(list(item), ["id", "title", "status"])
+
+    def test_narrows_sql_and_skips_tag_prefetch(self):
+        """
+        Test that unrequested columns are not read and tags are not fetched
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/core/api/todos/?fields=id,title")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        todo_queries = [q["sql"] for q in queries if 'FROM "core_todo"' in q["sql"]]
+        self.assertEqual(len(todo_queries), 1)
+        self.assertNotIn('"core_todo"."description"', todo_queries[0])
+        self.assertFalse(any("core_tag" in q["sql"] for q in queries))
+
+    def test_tags_still_prefetched_when_requested(self):
+        """
+        Test that asking for tags keeps them in one prefetch query
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/core/api/todos/?fields=title,tags")
+        self.assertEqual(response.json()["results"][0]["tags"][0]["name"], "tag2")
+        self.assertEqual(len([q for q in queries if 'FROM "core_tag"' in q["sql"]]), 1)
+
+    def test_pagination_with_sparse_fields(self):
+        """
+        Test that cursors work when the ordering field is not requested
+        """
+        response = self.client.get("/core/api/todos/?fields=title&page_size=2")
+        page = response.json()
+        self.assertEqual([t["title"] for t in page["results"]], ["Todo 2", "Todo 1"])
+        response = self.client.get(page["next"])
+        self.assertEqual([t["title"] for t in response.json()["results"]], ["Todo 0"])
+
+    def test_retrieve_with_fields(self):
+        """
+        Test that the detail endpoint honours ?fields= too
+        """
+        todo = Todo.objects.get(user=self.user, title="Todo 0")
+        response = self.client.get(f"/core/api/todos/{todo.pk}/?fields=title")
+        self.assertEqual(response.json(), {"title": "Todo 0"})
+
+    def test_unknown_field_rejected(self):
+        """
+        Test that an unknown field name is a validation error
+        """
+        response = self.client.get("/core/api/todos/?fields=title,owner")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.json())
+
+
+class ResponseCompressionTestCase(APITestCase):
+    """
+    Integration Tests for Accept-Encoding negotiated response compression
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="gzipuser", password="gzippassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        Todo.objects.bulk_create(
+            Todo(user=self.user, title=f"Todo {i}", description="Details " * 20)
+            for i in range(30)
+        )
+
+    def test_large_json_gzipped(self):
+        """
+        Test that a large list is gzipped when the client accepts it
+        """
+        plain = self.client.get("/core/api/todos/")
+        response = self.client.get("/core/api/todos/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_not_compressed_without_accept_encoding(self):
+        """
+        Test that clients that do not ask get the plain body
+        """
+        response = self.client.get("/core/api/todos/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertIn("Accept-Encoding", response["Vary"])
+        response = self.client.get("/core/api/todos/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_small_response_not_compressed(self):
+        """
+        Test that responses under COMPRESSION_MIN_SIZE are sent as is
+        """
+        todo = Todo.objects.filter(user=self.user).first()
+        response = self.client.get(
+            f"/core/api/todos/{todo.pk}/?fields=id", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_etag_weakened_and_still_matches(self):
+        """
+        Test that a compressed response's ETag is weak and revalidates
+        """
+        response = self.client.get("/core/api/todos/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        response = self.client.get(
+            "/core/api/todos/",
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_export_streamed_compressed(self):
+        """
+        Test that the export stays streaming and decodes to the plain body
+        """
+        plain = self.client.get("/core/api/todos/export/")
+        plain_body = b"".join(plain.streaming_content)
+        response = self.client.get(
+            "/core/api/todos/export/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        body = b"".join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), plain_body)
+
+
+class MarkOverdueInvalidationTestCase(APITransactionTestCase):
+    """
+    Integration Tests for cache invalidation by the mark_overdue command
+    running outside the web process
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="overdueuser", password="overduepassword"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.todo = Todo.objects.create(title="Late", user=self.user)
+        Todo.objects.filter(pk=self.todo.pk).update(
+            due_date=timezone.now() - timedelta(days=1)
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def run_command_elsewhere(self):
+        # Own thread, so its own database connection, and its own cache as
+        # a separate process would have
+        def sweep():
+            try:
+                with mock.patch("core.cache.cache", LocMemCache("other", {})):
+                    call_command("mark_overdue", stdout=io.StringIO())
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=sweep)
+        thread.start()
+        thread.join()
+
+    def test_list_cache_and_etag_invalidated(self):
+        """
+        Test that cached lists and ETags change once the sweep commits
+        """
+        first = self.client.get("/core/api/todos/")
+        self.assertEqual(first.data["results"][0]["status"], "OPEN")
+
+        self.run_command_elsewhere()
+
+        response = self.client.get("/core/api/todos/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["status"], "OVERDUE")
@@ -1,13 +1,17 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib import admin
 from django.core.exceptions import ValidationError
 from django.urls import reverse
 from django.contrib.admin import site
-from core.models import Todo, Tag
+from core.models import Todo, Tag, Tombstone
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
-from core.admin import TodoAdmin, TagAdmin
+from core.admin import CappedCountPaginator, TodoAdmin, TagAdmin
 from django.test import TestCase, RequestFactory
 from django.utils import timezone
 from django.contrib.admin.sites import AdminSite
@@ -105,6 +109,7 @@ class AdminTests(TestCase):
 
     def test_todo_count_with_todos(self):
         # Test todo_count when there are related Todos
+        self.tag.refresh_from_db(fields=["num_todos"])  # Tagged after loading
         count = self.tag.todo_count()  # Call the method on the Tag instance
         self.assertEqual(count, "2")  # Ensure it returns "2" as a string
 
@@ -193,3 +198,108 @@ class AdminTests(TestCase):
 
         # Assert that the title was updated successfully
         self.assertEqual(updated_todo.title, "Updated Todo")
+
+
+class AdminChangelistQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="password", email="admin@example.com"
+        )
+        self.client.force_login(self.user)
+        self.tags = [
+            Tag.objects.create(name=f"tag{i}", user=self.user) for i in range(3)
+        ]
+
+    def add_todos(self, count):
+        for i in range(count):
+            todo = Todo.objects.create(title=f"Todo {i}", user=self.user)
+            todo.tags.set(self.tags)
+
+    def test_todo_changelist_query_count(self):
+        """The todo changelist costs the same number of queries for any page size"""
+        self.add_todos(3)
+        url = reverse("admin:core_todo_changelist")
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+        self.add_todos(20)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertContains(response, "tag0, tag1, tag2")
+
+    def test_tag_changelist_query_count(self):
+        """Tag todo counts come from the changelist query, not one per row"""
+        self.add_todos(4)
+        for i in range(10):
+            Tag.objects.create(name=f"extra{i}", user=self.user)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("admin:core_tag_changelist"))
+        self.assertContains(response, '<td class="field-todo_count">4</td>')
+
+    def test_changelist_count_is_capped(self):
+        """Large result sets are counted only up to the paginator's cap"""
+        self.add_todos(3)
+        with mock.patch.object(CappedCountPaginator, "max_count", 2):
+            response = self.client.get(reverse("admin:core_todo_changelist"))
+        self.assertEqual(response.context["cl"].result_count, 2)
+
+
+class AdminBulkActionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password="password", email="admin@example.com"
+        )
+        self.client.force_login(self.user)
+        self.todos = [
+            Todo.objects.create(title=f"Todo {i}", user=self.user) for i in range(5)
+        ]
+        self.url = reverse("admin:core_todo_changelist")
+
+    def run_action(self, action, todos, **extra):
+        data = {
+            "action": action,
+            "_selected_action": [todo.pk for todo in todos],
+            **extra,
+        }
+        return self.client.post(self.url, data, follow=True)
+
+    def test_mark_completed_action(self):
+        """Marking todos completed costs the same queries for any selection"""
+        with CaptureQueriesContext(connection) as few:
+            self.run_action("mark_completed", self.todos[:1])
+        Todo.objects.update(status="OPEN")
+        with CaptureQueriesContext(connection) as many:
+            response = self.run_action("mark_completed", self.todos)
+
+        self.assertEqual(len(few), len(many))
+        self.assertContains(response, "5 todo(s) marked as COMPLETED.")
+        self.assertFalse(Todo.objects.exclude(status="COMPLETED").exists())
+
+    def test_add_and_remove_tag_actions(self):
+        """The tag name comes from the action form"""
+        self.run_action("add_tag", self.todos[:3], tag="Urgent")
+        self.assertEqual(Todo.objects.filter(tags__name="urgent").count(), 3)
+
+        self.run_action("remove_tag", self.todos, tag="urgent")
+        self.assertFalse(Todo.objects.filter(tags__name="urgent").exists())
+
+    def test_add_tag_action_requires_name(self):
+        """A missing tag name is reported instead of creating an empty tag"""
+        response = self.run_action("add_tag", self.todos, tag="")
+        self.assertContains(response, "Tag names must be 1 to 50 characters.")
+        self.assertFalse(Tag.objects.exists())
+
+    def test_delete_selected_uses_bulk_delete(self):
+        """Confirmed deletes write tombstones without per-row signals"""
+        response = self.run_action("delete_selected", self.todos, post="yes")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Todo.objects.exists())
+        self.assertEqual(Tombstone.objects.filter(kind="todo").count(), 5)
+
+    def test_actions_apply_to_search_results(self):
+        """Selecting all search results acts on exactly those todos"""
+        Todo.objects.filter(pk=self.todos[0].pk).update(title="Buy milk")
+        self.url += "?q=milk"
+        self.run_action("add_tag", self.todos, tag="shop", select_across="1")
+
+        self.assertEqual(list(Todo.objects.filter(tags__name="shop")), [self.todos[0]])
@@ -0,0 +1,115 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.authentication import token_cache
+from core.models import Todo
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username="tokenuser", password="12345")
+        self.token = Token.objects.create(user=self.user)
+        self.todo = Todo.objects.create(title="Token Todo", user=self.user)
+        self.client = APIClient()
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def get_todos(self, key):
+        return self.client.get("/core/api/todos/", HTTP_AUTHORIZATION=f"Token {key}")
+
+    def test_token_authenticates_without_password_hashing(self):
+        """
+        Test that token requests never hash a password
+        """
+        with mock.patch("django.contrib.auth.base_user.check_password") as check:
+            response = self.get_todos(self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        check.assert_not_called()
+
+    def test_cached_token_skips_user_query(self):
+        """
+        Test that a repeated request resolves the user from the cache
+        """
+        url = f"/core/api/todos/{self.todo.id}/"
+        auth = f"Token {self.token.key}"
+        # Cold cache: one joined token/user query plus the version, todo and
+        # tag queries
+        with self.assertNumQueries(4):
+            self.client.get(url, HTTP_AUTHORIZATION=auth)
+        # Warm cache: only the version, todo and tag queries
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_AUTHORIZATION=auth)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cache_entries_expire(self):
+        """
+        Test that cached lookups are dropped once their TTL has passed
+        """
+        self.get_todos(self.token.key)
+        self.assertIsNotNone(token_cache.get(self.token.key))
+        with mock.patch(
+            "core.cache.time.monotonic",
+            return_value=1e12,
+        ):
+            self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_deactivated_user_loses_access(self):
+        """
+        Test that deactivating a user stops their cached token working
+        """
+        self.assertEqual(self.get_todos(self.token.key).status_code, 200)
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.get_todos(self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_rejected(self):
+        """
+        Test that an unknown token is rejected
+        """
+        response = self.get_todos("not-a-real-token")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_issue_token_command(self):
+        """
+        Test that issue_token prints the user's token and can rotate it
+        """
+        out = StringIO()
+        call_command("issue_token", "tokenuser", stdout=out)
+        self.assertEqual(out.getvalue().strip(), self.token.key)
+
+        out = StringIO()
+        call_command("issue_token", "tokenuser", "--rotate", stdout=out)
+        new_key = out.getvalue().strip()
+        self.assertNotEqual(new_key, self.token.key)
+        self.assertTrue(Token.objects.filter(key=new_key, user=self.user).exists())
+
+        with self.assertRaises(CommandError):
+            call_command("issue_token", "nobody", stdout=StringIO())
+
+    def test_revoke_token_command_evicts_cache(self):
+        """
+        Test that revoking a token stops it working immediately
+        """
+        self.assertEqual(self.get_todos(self.token.key).status_code, 200)
+
+        call_command("revoke_token", "tokenuser", stdout=StringIO())
+
+        self.assertFalse(Token.objects.filter(user=self.user).exists())
+        response = self.get_todos(self.token.key)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        with self.assertRaises(CommandError):
+            call_command("revoke_token", "tokenuser", stdout=StringIO())
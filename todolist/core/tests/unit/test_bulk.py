@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core import bulk
+from core.cache import get_todo_version
+from core.models import Tag, Todo, TodoStatusCount, Tombstone
+from core.serializers import MAX_TAGS
+
+
+class BulkOperationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulk", password="12345")
+        self.other = User.objects.create_user(username="other", password="12345")
+        self.todos = [
+            Todo.objects.create(title=f"Todo {i}", user=self.user) for i in range(3)
+        ]
+        self.foreign = Todo.objects.create(title="Foreign", user=self.other)
+
+    def all_todos(self):
+        return Todo.objects.filter(pk__in=[t.pk for t in self.todos + [self.foreign]])
+
+    def test_set_status_is_one_update(self):
+        """Status changes touch updated_at and bump every owner's version"""
+        version = get_todo_version(self.other.pk)
+        # savepoint, old statuses, update, status rollup, versions, release
+        with self.assertNumQueries(6):
+            updated = bulk.set_status(self.all_todos(), "COMPLETED")
+
+        self.assertEqual(updated, 4)
+        self.assertFalse(Todo.objects.exclude(status="COMPLETED").exists())
+        self.assertNotEqual(get_todo_version(self.other.pk), version)
+
+    def test_reopen_skips_past_due_todos(self):
+        """Todo.clean forbids past due dates, so those todos stay closed"""
+        Todo.objects.update(status="COMPLETED")
+        Todo.objects.filter(pk=self.todos[0].pk).update(
+            due_date=timezone.now() - timedelta(days=1)
+        )
+
+        self.assertEqual(bulk.set_status(self.all_todos(), "OPEN"), 3)
+        self.assertEqual(Todo.objects.get(pk=self.todos[0].pk).status, "COMPLETED")
+
+    def test_add_tag_creates_tag_per_owner(self):
+        """Each owner gets their own tag, and existing links are kept"""
+        self.todos[0].set_tags(["urgent"])
+
+        self.assertEqual(bulk.add_tag(self.all_todos(), " Urgent "), 3)
+        for todo in self.todos + [self.foreign]:
+            self.assertEqual([t.name for t in todo.tags.all()], ["urgent"])
+        self.assertEqual(Tag.objects.get(user=self.other).name, "urgent")
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
+
+    def test_add_tag_query_count_constant(self):
+        """Owners' tags are looked up and created together, not per owner"""
+        with CaptureQueriesContext(connection) as two_owners:
+            bulk.add_tag(self.all_todos(), "first")
+
+        others = [
+            User.objects.create_user(username=f"owner{i}", password="12345")
+            for i in range(3)
+        ]
+        for user in others:
+            Todo.objects.create(title="Theirs", user=user)
+        with self.assertNumQueries(len(two_owners.captured_queries)):
+            self.assertEqual(bulk.add_tag(Todo.objects.all(), "second"), 7)
+        self.assertEqual(Tag.objects.filter(name="second").count(), 5)
+
+    def test_add_tag_respects_tag_limit(self):
+        """Todos that already carry the maximum number of tags are skipped"""
+        self.todos[0].set_tags([f"t{i}" for i in range(MAX_TAGS)])
+
+        self.assertEqual(bulk.add_tag(self.all_todos(), "extra"), 3)
+        self.assertEqual(self.todos[0].tags.count(), MAX_TAGS)
+
+    def test_add_tag_rejects_invalid_name(self):
+        """Blank and overlong tag names are rejected"""
+        with self.assertRaises(ValidationError):
+            bulk.add_tag(self.all_todos(), "  ")
+        with self.assertRaises(ValidationError):
+            bulk.add_tag(self.all_todos(), "x" * 51)
+
+    def test_remove_tag(self):
+        """Only the named tag is unlinked; the tag itself is kept"""
+        for todo in self.todos:
+            todo.set_tags(["home", "work"])
+        before = Todo.objects.get(pk=self.todos[0].pk).updated_at
+
+        self.assertEqual(bulk.remove_tag(self.all_todos(), "HOME"), 3)
+        for todo in self.todos:
+            self.assertEqual([t.name for t in todo.tags.all()], ["work"])
+        self.assertTrue(Tag.objects.filter(name="home").exists())
+        self.assertGreater(Todo.objects.get(pk=self.todos[0].pk).updated_at, before)
+
+    def test_delete_todos_records_tombstones(self):
+        """Deleting in bulk leaves the same tombstones as deleting one by one"""
+        self.todos[0].set_tags(["home"])
+
+        self.assertEqual(bulk.delete_todos(self.all_todos()), 4)
+        self.assertFalse(Todo.objects.exists())
+        self.assertFalse(Todo.tags.through.objects.exists())
+        self.assertEqual(
+            set(Tombstone.objects.values_list("user_id", "kind", "object_id")),
+            {(t.user_id, "todo", t.pk) for t in self.todos + [self.foreign]},
+        )
+        # Written once in bulk, not again by the per-row delete receivers
+        self.assertEqual(Tombstone.objects.count(), 4)
+        self.assertFalse(TodoStatusCount.objects.exclude(count=0).exists())
@@ -0,0 +1,62 @@
+import gzip
+import unittest
+
+from django.test import SimpleTestCase
+
+from core.compression import CODECS, Codec, _gzip, brotli, negotiate, zstandard
+
+GZIP = {"gzip": Codec("gzip", 6, _gzip)}
+
+
+class NegotiateTests(SimpleTestCase):
+    def test_picks_accepted_codec(self):
+        self.assertEqual(negotiate("gzip, deflate", GZIP).name, "gzip")
+        self.assertEqual(negotiate("*", GZIP).name, "gzip")
+
+    def test_nothing_acceptable(self):
+        for header in (None, "", "identity", "deflate", "gzip;q=0", "*;q=0"):
+            self.assertIsNone(negotiate(header, GZIP), header)
+
+    def test_quality_and_preference(self):
+        """The highest q wins; ties go to the first (preferred) codec"""
+        codecs = {"br": Codec("br", 4, None), **GZIP}
+        self.assertEqual(negotiate("gzip, br", codecs).name, "br")
+        self.assertEqual(negotiate("gzip;q=1.0, br;q=0.5", codecs).name, "gzip")
+        self.assertEqual(negotiate("br;q=0, *", codecs).name, "gzip")
+        self.assertEqual(negotiate("GZIP;Q=0.8, br;q=bad", codecs).name, "gzip")
+
+
+class CodecTests(SimpleTestCase):
+    data = b'{"title": "Todo"}\n' * 1000
+
+    def test_gzip_round_trip(self):
+        codec = CODECS["gzip"]
+        self.assertEqual(gzip.decompress(codec.compress(self.data)), self.data)
+        self.assertEqual(gzip.decompress(codec.compress(self.data, 1)), self.data)
+
+    def test_gzip_stream_is_incremental(self):
+        """Every chunk is flushed, so a client can decode it on arrival"""
+        codec = CODECS["gzip"]
+        parts = list(codec.stream(iter([self.data, self.data])))
+        self.assertGreater(len(parts[0]), 0)
+        self.assertEqual(gzip.decompress(b"".join(parts)), self.data * 2)
+
+    @unittest.skipUnless(brotli, "brotli is not installed")
+    def test_brotli_round_trip(self):
+        codec = CODECS["br"]
+        self.assertEqual(brotli.decompress(codec.compress(self.data)), self.data)
+        streamed = b"".join(codec.stream(iter([self.data, self.data])))
+        self.assertEqual(brotli.decompress(streamed), self.data * 2)
+
+    @unittest.skipUnless(zstandard, "zstandard is not installed")
+    def test_zstd_round_trip(self):
+        codec = CODECS["zstd"]
+        decompressor = zstandard.ZstdDecompressor()
+        streamed = b"".join(codec.stream(iter([self.data, self.data])))
+        self.assertEqual(
+            decompressor.decompressobj().decompress(streamed), self.data * 2
+        )
+        self.assertEqual(
+            decompressor.decompressobj().decompress(codec.compress(self.data)),
+            self.data,
+        )
@@ -0,0 +1,210 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from core import importer
+from core.models import ImportJob, Tag, Todo, TodoStatusCount
+
+
+class ImportTodosCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="12345")
+        Tag.objects.create(name="Work", user=self.user)
+        self.due = (timezone.now() + timedelta(days=3)).isoformat()
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, "w", encoding="utf-8") as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def ndjson(self, rows):
+        return "".join(json.dumps(row) + "\n" for row in rows)
+
+    def run_import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_todos", path, "--user", "importer", *args, stdout=out, stderr=err
+        )
+        return out.getvalue(), err.getvalue()
+
+    def test_import_ndjson_with_tags(self):
+        """
+        Test importing NDJSON rows, reusing existing tags
+        """
+        path = self.write_file(
+            ".ndjson",
+            self.ndjson(
+                [
+                    {"title": "One", "tags": ["work", "home"], "due_date": self.due},
+                    {"title": "Two", "status": "WORKING", "tags": [{"name": "Home"}]},
+                ]
+            ),
+        )
+        out, err = self.run_import(path)
+
+        self.assertIn("Imported 2 todos", out)
+        self.assertIn("rows/s", out)
+        self.assertEqual(err, "")
+        one = Todo.objects.get(title="One")
+        self.assertEqual(set(one.tags.values_list("name", flat=True)), {"work", "home"})
+        self.assertEqual(Todo.objects.get(title="Two").status, "WORKING")
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(
+            dict(Tag.objects.values_list("name", "num_todos")), {"work": 1, "home": 2}
+        )
+        self.assertEqual(
+            dict(
+                TodoStatusCount.objects.filter(count__gt=0).values_list(
+                    "status", "count"
+                )
+            ),
+            {"OPEN": 1, "WORKING": 1},
+        )
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        """
+        Test that rows breaking serializer/model rules are skipped
+        """
+        past = (timezone.now() - timedelta(days=1)).isoformat()
+        path = self.write_file(
+            ".ndjson",
+            self.ndjson(
+                [
+                    {"title": ""},
+                    {"title": "Past", "due_date": past},
+                    {"title": "Bad status", "status": "DONE"},
+                    {"title": "Dupes", "tags": ["a", "A"]},
+                    {"title": "Too many", "tags": ["a", "b", "c", "d", "e", "f"]},
+                    {"title": "x" * 101},
+                    {"title": "Fine"},
+                ]
+            )
+            + "not json\n",
+        )
+        out, err = self.run_import(path)
+
+        self.assertIn("Imported 1 todos (7 invalid rows skipped)", out)
+        self.assertIn("Row 2: {'due_date': ['Due date cannot be in the past.']}", err)
+        self.assertIn("Tags must be unique.", err)
+        self.assertIn("Cannot add more than 5 tags.", err)
+        self.assertEqual(list(Todo.objects.values_list("title", flat=True)), ["Fine"])
+
+    def test_malformed_rows_are_reported_and_skipped(self):
+        """
+        Test that values of the wrong type fail their row instead of the import
+        """
+        path = self.write_file(
+            ".ndjson",
+            self.ndjson(
+                [
+                    {"title": ["x"]},
+                    {"title": "List status", "status": ["X"]},
+                    {"title": "Dict description", "description": {"a": 1}},
+                    {"title": "Number due", "due_date": 5},
+                    {"title": "Nameless tag", "tags": [{"label": "x"}]},
+                    {"title": "Tags not a list", "tags": "work"},
+                    {"title": "Fine"},
+                ]
+            ),
+        )
+        out, err = self.run_import(path)
+
+        self.assertIn("Imported 1 todos (6 invalid rows skipped)", out)
+        for position, field in enumerate(
+            ["title", "status", "description", "due_date", "tags", "tags"], start=1
+        ):
+            self.assertIn(f"Row {position}: {{'{field}': [", err)
+        self.assertEqual(list(Todo.objects.values_list("title", flat=True)), ["Fine"])
+
+    def test_import_csv_from_export_format(self):
+        """
+        Test importing CSV in the layout written by the export endpoint
+        """
+        path = self.write_file(
+            ".csv",
+            "id,title,description,created_at,updated_at,due_date,status,tags\n"
+            f'1,Csv,"Has, comma",,,{self.due},OPEN,"work,errands"\n',
+        )
+        self.run_import(path)
+
+        todo = Todo.objects.get(title="Csv")
+        self.assertEqual(todo.description, "Has, comma")
+        self.assertEqual(
+            set(todo.tags.values_list("name", flat=True)), {"work", "errands"}
+        )
+
+    def test_resume_after_crash(self):
+        """
+        Test that a failed batch is retried on the next run without
+        duplicating rows from committed batches
+        """
+        path = self.write_file(
+            ".ndjson", self.ndjson([{"title": f"Row {i}"} for i in range(5)])
+        )
+        real_import_batch = importer.import_batch
+        calls = []
+
+        def crash_on_second_batch(job, batch):
+            calls.append(len(batch))
+            if len(calls) == 2:
+                raise RuntimeError("simulated crash")
+            return real_import_batch(job, batch)
+
+        with mock.patch(
+            "core.management.commands.import_todos.import_batch",
+            crash_on_second_batch,
+        ):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, "--batch-size", "2")
+
+        self.assertEqual(Todo.objects.count(), 2)
+        self.assertEqual(ImportJob.objects.get(name=path).rows_done, 2)
+
+        out, _ = self.run_import(path, "--batch-size", "2")
+        self.assertIn("Resuming job", out)
+        self.assertEqual(
+            sorted(Todo.objects.values_list("title", flat=True)),
+            [f"Row {i}" for i in range(5)],
+        )
+
+        # A finished job is refused unless restarted
+        with self.assertRaisesMessage(CommandError, "already finished"):
+            self.run_import(path)
+        self.assertEqual(Todo.objects.count(), 5)
+        self.run_import(path, "--restart")
+        self.assertEqual(Todo.objects.count(), 10)
+
+    def test_finished_stdin_job_is_not_resumed(self):
+        """
+        Test that a second stdin import is refused rather than skipping rows
+        """
+        first = StringIO(self.ndjson([{"title": "One"}, {"title": "Two"}]))
+        with mock.patch("sys.stdin", first):
+            self.run_import("-")
+
+        second = StringIO(self.ndjson([{"title": "Three"}]))
+        with mock.patch("sys.stdin", second):
+            with self.assertRaisesMessage(CommandError, "already finished"):
+                self.run_import("-")
+            out, _ = self.run_import("-", "--job", "second")
+
+        self.assertIn("Imported 1 todos", out)
+        self.assertEqual(Todo.objects.count(), 3)
+
+    def test_unknown_user(self):
+        """
+        Test that importing for a missing user fails cleanly
+        """
+        with self.assertRaises(CommandError):
+            call_command("import_todos", "-", "--user", "nobody")
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from core.cache import get_todo_version
+from core.management.commands import mark_overdue
+from core.bulk import set_status
+from core.models import Todo, TodoStatusCount
+
+
+class MarkOverdueCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sweeper", password="12345")
+        self.other = User.objects.create_user(username="other", password="12345")
+        self.past = timezone.now() - timedelta(days=1)
+
+    def make_todo(self, user, status, due_date):
+        todo = Todo.objects.create(user=user, title=status, status=status)
+        # Past due dates are rejected by Todo.clean, so set them directly
+        Todo.objects.filter(pk=todo.pk).update(due_date=due_date)
+        return todo
+
+    def run_sweep(self, *args):
+        out = StringIO()
+        with mock.patch("core.management.commands.mark_overdue.time.sleep"):
+            call_command("mark_overdue", *args, stdout=out)
+        return out.getvalue()
+
+    def test_marks_past_due_active_todos(self):
+        """Only past-due OPEN, WORKING and PENDING_REVIEW todos are flipped"""
+        future = timezone.now() + timedelta(days=1)
+        flipped = [
+            self.make_todo(self.user, status, self.past)
+            for status in ("OPEN", "WORKING", "PENDING_REVIEW")
+        ]
+        untouched = [
+            self.make_todo(self.user, "COMPLETED", self.past),
+            self.make_todo(self.user, "CANCELLED", self.past),
+            self.make_todo(self.user, "OPEN", future),
+            self.make_todo(self.user, "OPEN", None),
+        ]
+
+        output = self.run_sweep()
+
+        self.assertIn("Marked 3 todo(s) as OVERDUE.", output)
+        for todo in flipped:
+            self.assertEqual(Todo.objects.get(pk=todo.pk).status, "OVERDUE")
+        for todo in untouched:
+            self.assertEqual(Todo.objects.get(pk=todo.pk).status, todo.status)
+
+    def test_processes_in_batches(self):
+        """Todos are updated in batches of --batch-size until none remain"""
+        for _ in range(5):
+            self.make_todo(self.user, "OPEN", self.past)
+
+        with mock.patch(
+            "core.management.commands.mark_overdue.mark_overdue_batch",
+            wraps=mark_overdue.mark_overdue_batch,
+        ) as batch:
+            output = self.run_sweep("--batch-size", "2")
+
+        self.assertIn("Marked 5 todo(s) as OVERDUE.", output)
+        self.assertEqual(batch.call_count, 3)
+        self.assertFalse(Todo.objects.exclude(status="OVERDUE").exists())
+
+    def test_touches_updated_at_and_bumps_versions(self):
+        """Affected users see the change through the cache and delta sync"""
+        todo = self.make_todo(self.user, "OPEN", self.past)
+        before = Todo.objects.get(pk=todo.pk).updated_at
+        user_version = get_todo_version(self.user.pk)
+        other_version = get_todo_version(self.other.pk)
+
+        self.run_sweep()
+
+        self.assertGreater(Todo.objects.get(pk=todo.pk).updated_at, before)
+        self.assertNotEqual(get_todo_version(self.user.pk), user_version)
+        self.assertEqual(get_todo_version(self.other.pk), other_version)
+
+    def test_rows_changed_after_select_are_skipped(self):
+        """A todo closed between the SELECT and the UPDATE stays closed"""
+        late = self.make_todo(self.user, "OPEN", self.past)
+        closed = self.make_todo(self.user, "OPEN", self.past)
+        real_now = timezone.now
+        now = real_now()
+        pending = [closed]
+
+        def close_then_now():
+            # First call comes after the candidates were read, before they
+            # are updated
+            if pending:
+                set_status(Todo.objects.filter(pk=pending.pop().pk), "COMPLETED")
+            return real_now()
+
+        with mock.patch.object(mark_overdue.timezone, "now", close_then_now):
+            self.assertEqual(mark_overdue.mark_overdue_batch(now, 10), 1)
+
+        self.assertEqual(Todo.objects.get(pk=late.pk).status, "OVERDUE")
+        self.assertEqual(Todo.objects.get(pk=closed.pk).status, "COMPLETED")
+        counts = dict(
+            TodoStatusCount.objects.filter(user=self.user, count__gt=0).values_list(
+                "status", "count"
+            )
+        )
+        self.assertEqual(counts, {"OVERDUE": 1, "COMPLETED": 1})
+
+    def test_rejects_invalid_batch_size(self):
+        """A batch size below 1 is an error"""
+        with self.assertRaises(CommandError):
+            self.run_sweep("--batch-size", "0")
@@ -0,0 +1,91 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.bulk import merge_tags
+from core.models import Tag, Todo, Tombstone
+
+
+class MergeTagsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="merger", password="12345")
+        self.other = User.objects.create_user(username="other", password="12345")
+        self.todos = [
+            Todo.objects.create(title=f"Todo {i}", user=self.user) for i in range(4)
+        ]
+        self.todos[0].set_tags(["work", "work-items"])
+        self.todos[1].set_tags(["work-items", "Work Items", "home"])
+        self.todos[2].set_tags(["work items"])
+        self.todos[3].set_tags(["home"])
+        Todo.objects.create(title="Theirs", user=self.other).set_tags(["work-items"])
+
+    def tag_names(self, todo):
+        return sorted(todo.tags.values_list("name", flat=True))
+
+    def test_merge_into_existing_tag(self):
+        """Sources are repointed without duplicate links and then deleted"""
+        target, changed = merge_tags(self.user, ["Work-Items", "work items"], "work")
+
+        self.assertEqual(changed, 3)
+        self.assertEqual(target.num_todos, 3)
+        self.assertEqual(self.tag_names(self.todos[0]), ["work"])
+        self.assertEqual(self.tag_names(self.todos[1]), ["home", "work"])
+        self.assertEqual(self.tag_names(self.todos[2]), ["work"])
+        self.assertEqual(self.tag_names(self.todos[3]), ["home"])
+        self.assertEqual(
+            sorted(Tag.objects.filter(user=self.user).values_list("name", flat=True)),
+            ["home", "work"],
+        )
+        # Other users' tags of the same name are untouched
+        self.assertEqual(Tag.objects.get(user=self.other).num_todos, 1)
+        self.assertEqual(Tombstone.objects.filter(kind="tag").count(), 2)
+
+    def test_rename(self):
+        """A single source and a new name renames the tag in place"""
+        home = Tag.objects.get(user=self.user, name="home")
+
+        target, changed = merge_tags(self.user, ["HOME"], "house")
+
+        self.assertEqual((target.pk, target.name, changed), (home.pk, "house", 0))
+        self.assertEqual(self.tag_names(self.todos[3]), ["house"])
+
+    def test_merge_into_new_name(self):
+        """Merging into a new name renames one source and merges the rest"""
+        target, changed = merge_tags(self.user, ["work-items", "work items"], "job")
+
+        # "work items" is renamed, so only the work-items links move
+        self.assertEqual(changed, 2)
+        self.assertEqual(target.num_todos, 3)
+        self.assertEqual(self.tag_names(self.todos[1]), ["home", "job"])
+
+    def test_query_count_does_not_grow_with_todos(self):
+        """The merge runs a constant number of statements"""
+        with CaptureQueriesContext(connection) as small:
+            merge_tags(self.user, ["work-items"], "work")
+        for i in range(20):
+            Todo.objects.create(title=f"More {i}", user=self.user).set_tags(["a", "b"])
+        with self.assertNumQueries(len(small.captured_queries)):
+            merge_tags(self.user, ["a"], "b")
+
+    def test_unknown_source_is_rejected(self):
+        """Nothing changes when a source tag does not exist"""
+        with self.assertRaises(ValidationError):
+            merge_tags(self.user, ["work-items", "missing"], "work")
+        self.assertTrue(Tag.objects.filter(user=self.user, name="work-items").exists())
+
+    def test_command(self):
+        """The management command merges for the named user"""
+        out = StringIO()
+        call_command("merge_tags", "merger", "work", "work-items", stdout=out)
+        self.assertIn(
+            'Merged into "work": 2 todo(s) changed, 2 now tagged.', out.getvalue()
+        )
+
+        with self.assertRaises(CommandError):
+            call_command("merge_tags", "nobody", "work", "home", stdout=out)
@@ -5,6 +5,8 @@ from datetime import timedelta
 from core.models import Todo, Tag
 from django.contrib import admin
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 
 class TodoModelTest(TestCase):
@@ -114,6 +116,54 @@ class TodoModelTest(TestCase):
         # Check that the tag name is normalized
         self.assertEqual(tag.name, "testtag")
 
+    def test_set_tags_scoped_to_user(self):
+        """
+        Test that set_tags reuses the owner's tags and never another user's
+        """
+        other_user = get_user_model().objects.create_user(
+            username="otheruser", password="otherpassword"
+        )
+        other_tag = Tag.objects.create(name="Shared", user=other_user)
+        own_tag = Tag.objects.create(name="Mine", user=self.user)
+
+        self.todo.set_tags(["shared", " MINE "])
+
+        tags = list(self.todo.tags.all())
+        self.assertEqual(len(tags), 2)
+        self.assertIn(own_tag, tags)
+        self.assertNotIn(other_tag, tags)
+        self.assertTrue(all(tag.user == self.user for tag in tags))
+
+    def test_set_tags_only_writes_difference(self):
+        """
+        Test that set_tags leaves unchanged tags alone and diffs the rest
+        """
+        self.todo.set_tags(["work", "urgent"])
+        work = Tag.objects.get(name="work", user=self.user)
+
+        # Unchanged tags: two reads and no writes
+        with CaptureQueriesContext(connection) as ctx:
+            self.todo.set_tags(["Work", "urgent"])
+        statements = [
+            q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]
+        ]
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(all(sql.startswith("SELECT") for sql in statements))
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.todo.set_tags(["work", "home"])
+        writes = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith(("INSERT", "DELETE"))
+            and '"core_todo_tags"' in q["sql"]
+        ]
+        self.assertEqual(len(writes), 2)
+        self.assertEqual(
+            set(self.todo.tags.values_list("name", flat=True)), {"work", "home"}
+        )
+        self.assertIn(work, self.todo.tags.all())
+
 
 class TagModelTest(TestCase):
     def setUp(self):
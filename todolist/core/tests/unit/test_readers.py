@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Todo
+from core.readers import TodoReader
+from core.serializers import TodoSerializer
+
+
+class TodoReaderParityTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="12345")
+        due = timezone.now() + timedelta(days=3, microseconds=123)
+        for i in range(6):
+            todo = Todo.objects.create(
+                user=self.user,
+                title=f"Todo {i} é",
+                description="Details" if i % 2 else None,
+                due_date=due if i % 3 else None,
+                status="COMPLETED" if i == 4 else "OPEN",
+            )
+            # Several tags per todo, added out of name order
+            todo.set_tags(["zeta", "alpha", f"only{i}"][: i % 4])
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def assertSameOutput(self, fields=None):
+        queryset = Todo.objects.filter(user=self.user).order_by("-created_at", "-id")
+        expected = TodoSerializer(
+            queryset.prefetch_related("tags"), many=True, fields=fields
+        ).data
+        reader = TodoReader(fields)
+        actual = reader.serialize(reader.queryset(queryset))
+        self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_full_output_is_byte_identical(self):
+        """The reader renders exactly what TodoSerializer renders"""
+        self.assertSameOutput()
+
+    def test_sparse_fields_are_byte_identical(self):
+        """Field subsets keep TodoSerializer's field order"""
+        self.assertSameOutput(["status", "tags", "id"])
+        self.assertSameOutput(["title", "due_date"])
+
+    def test_non_utc_time_zone(self):
+        """Datetimes are shifted to the active time zone like DRF does"""
+        with timezone.override("Asia/Kolkata"):
+            self.assertSameOutput()
+
+    def test_empty_page(self):
+        """An empty page needs no tag query"""
+        reader = TodoReader()
+        with self.assertNumQueries(0):
+            self.assertEqual(reader.serialize([]), [])
@@ -0,0 +1,94 @@
+import io
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import parsers, renderers
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        "results": [
+            {
+                "id": 1,
+                "title": "Café ☕",
+                "description": None,
+                "created_at": "2024-01-02T03:04:05.123456Z",
+                "tags": [{"id": 2, "name": "home"}],
+                "done": False,
+            }
+        ],
+        "next": None,
+    }
+
+    def test_matches_stdlib_output(self):
+        """Serializer output renders to the same bytes as JSONRenderer"""
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_datetimes_rendered_natively(self):
+        """Datetimes are written as ISO 8601 with Z for UTC"""
+        value = datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            FastJSONRenderer().render({"at": value}),
+            b'{"at":"2024-01-02T03:04:05.123456Z"}',
+        )
+
+    def test_other_types_use_drf_encoder(self):
+        """Types orjson lacks fall back to DRF's encoder"""
+        data = {"amount": Decimal("1.50"), "label": gettext_lazy("Open"), 3: "x"}
+        self.assertEqual(
+            FastJSONRenderer().render(data), b'{"amount":1.5,"label":"Open","3":"x"}'
+        )
+
+    def test_line_separators_escaped(self):
+        """U+2028 and U+2029 are escaped, keeping output valid JavaScript"""
+        data = {"title": "a\u2028b\u2029c"}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indent_and_fallback_use_stdlib(self):
+        """Indented output and installs without orjson use JSONRenderer"""
+        renderer = FastJSONRenderer()
+        self.assertEqual(
+            renderer.render(self.data, "application/json; indent=2"),
+            JSONRenderer().render(self.data, "application/json; indent=2"),
+        )
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                renderer.render(self.data), JSONRenderer().render(self.data)
+            )
+
+    def test_none_renders_empty(self):
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+
+class FastJSONParserTests(SimpleTestCase):
+    def parse(self, body, **context):
+        return FastJSONParser().parse(io.BytesIO(body), parser_context=context)
+
+    def test_parses_like_stdlib(self):
+        body = '{"title": "Café", "tags": [{"name": "x"}], "n": 1.5}'.encode()
+        self.assertEqual(self.parse(body), JSONParser().parse(io.BytesIO(body)))
+
+    def test_other_encodings(self):
+        body = '{"title": "Café"}'.encode("latin-1")
+        self.assertEqual(self.parse(body, encoding="latin-1"), {"title": "Café"})
+
+    def test_invalid_json(self):
+        """Malformed bodies and NaN raise ParseError"""
+        for body in (b'{"title": ', b'{"n": NaN}', b"\xff"):
+            with self.assertRaises(ParseError):
+                self.parse(body)
+
+    def test_fallback_without_orjson(self):
+        with mock.patch.object(parsers, "orjson", None):
+            self.assertEqual(self.parse(b'{"a": [1]}'), {"a": [1]})
@@ -4,6 +4,8 @@ from django.utils import timezone
 from django.contrib.auth.models import User
 from rest_framework.exceptions import ValidationError
 from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from core.models import Todo, Tag
 from core.serializers import TodoSerializer, TagSerializer
 from rest_framework import status
@@ -232,3 +234,38 @@ class TodoSerializerTests(TestCase):
         self.assertIn("title", response.data)
         self.assertIn("due_date", response.data)
         self.assertIn("tags", response.data)
+
+    def test_todo_serializer_update_unchanged_tags_skips_m2m_writes(self):
+        """
+        Test that re-sending the same tags does not touch the through-table
+        """
+        request = self.factory.post("/todos/", self.valid_todo_data)
+        request.user = self.user
+        serializer = TodoSerializer(
+            data=self.valid_todo_data, context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        todo = serializer.save()
+
+        update_data = {
+            "title": "Renamed",
+            "tags": [{"name": "personal"}, {"name": "WORK"}],
+        }
+        update_request = self.factory.patch(f"/todos/{todo.id}/", update_data)
+        update_request.user = self.user
+        update_serializer = TodoSerializer(
+            todo, data=update_data, partial=True, context={"request": update_request}
+        )
+        self.assertTrue(update_serializer.is_valid(), update_serializer.errors)
+        with CaptureQueriesContext(connection) as ctx:
+            update_serializer.save()
+
+        self.assertFalse(
+            [
+                q
+                for q in ctx.captured_queries
+                if '"core_todo_tags"' in q["sql"] and not q["sql"].startswith("SELECT")
+            ]
+        )
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+        self.assertEqual(todo.tags.count(), 2)
@@ -0,0 +1,129 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import RequestFactory, TestCase
+
+from core import bulk
+from core.models import Tag, Todo
+from core.serializers import TodoSerializer
+
+
+class TagCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="counter", password="12345")
+        self.todos = [
+            Todo.objects.create(title=f"Todo {i}", user=self.user) for i in range(3)
+        ]
+        self.home = Tag.objects.create(name="home", user=self.user)
+        self.work = Tag.objects.create(name="work", user=self.user)
+
+    def counts(self):
+        return dict(Tag.objects.values_list("name", "num_todos"))
+
+    def assertCountsCorrect(self):
+        # The stored counts always match the through-table
+        actual = dict(
+            Tag.objects.annotate(actual=Tag.counted_todos()).values_list(
+                "name", "actual"
+            )
+        )
+        self.assertEqual(self.counts(), actual)
+
+    def test_forward_add_remove_and_clear(self):
+        """Changing a todo's tags updates each tag's count"""
+        self.todos[0].tags.add(self.home, self.work)
+        self.todos[1].tags.add(self.home)
+        self.todos[1].tags.add(self.home)  # already linked
+        self.assertEqual(self.counts(), {"home": 2, "work": 1})
+
+        self.todos[0].tags.remove(self.work, self.work)
+        self.todos[2].tags.remove(self.home)  # never linked
+        self.assertEqual(self.counts(), {"home": 2, "work": 0})
+
+        self.todos[1].tags.clear()
+        self.assertEqual(self.counts(), {"home": 1, "work": 0})
+
+    def test_reverse_add_remove_and_clear(self):
+        """Changing a tag's todos updates that tag's count"""
+        self.home.todos.add(*self.todos)
+        self.assertEqual(self.counts()["home"], 3)
+
+        self.home.todos.remove(self.todos[0])
+        self.assertEqual(self.counts()["home"], 2)
+
+        self.home.todos.clear()
+        self.assertEqual(self.counts()["home"], 0)
+
+    def test_set_tags_and_delete(self):
+        """set_tags and deleting a todo keep the counts right"""
+        self.todos[0].set_tags(["home", "work", "new"])
+        self.todos[1].set_tags(["home"])
+        self.todos[0].set_tags(["home", "new"])
+        self.assertEqual(self.counts(), {"home": 2, "work": 0, "new": 1})
+
+        self.todos[0].delete()
+        self.assertEqual(self.counts(), {"home": 1, "work": 0, "new": 0})
+
+    def test_saving_a_tag_keeps_its_count(self):
+        """A stale tag instance does not overwrite the stored count"""
+        self.todos[0].tags.add(self.home)
+        self.home.name = "house"
+        self.home.save()
+        self.assertEqual(self.counts()["house"], 1)
+        self.home.refresh_from_db(fields=["num_todos"])
+        self.assertEqual(self.home.todo_count(), "1")
+
+    def test_bulk_paths(self):
+        """Bulk create and the admin bulk helpers maintain the counts"""
+        request = RequestFactory().post("/")
+        request.user = self.user
+        serializer = TodoSerializer(
+            data=[
+                {"title": "A", "tags": [{"name": "home"}, {"name": "bulk"}]},
+                {"title": "B", "tags": [{"name": "bulk"}]},
+            ],
+            many=True,
+            context={"request": request},
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=self.user)
+        self.assertEqual(self.counts(), {"home": 1, "work": 0, "bulk": 2})
+
+        todos = Todo.objects.filter(user=self.user)
+        bulk.add_tag(todos, "work")
+        bulk.remove_tag(todos, "bulk")
+        self.assertEqual(self.counts(), {"home": 1, "work": 5, "bulk": 0})
+
+        bulk.delete_todos(todos.filter(tags__name="home"))
+        self.assertEqual(self.counts(), {"home": 0, "work": 4, "bulk": 0})
+        self.assertCountsCorrect()
+
+
+class RecountTagsCommandTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="counter", password="12345")
+        self.todo = Todo.objects.create(title="Todo", user=user)
+        self.todo.set_tags(["home", "work"])
+        Tag.objects.filter(name="home").update(num_todos=7)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("recount_tags", *args, stdout=out)
+        return out.getvalue()
+
+    def test_check_reports_wrong_counts(self):
+        """--check lists drifted counts and fails without changing them"""
+        with self.assertRaises(CommandError):
+            self.run_command("--check")
+        self.assertEqual(Tag.objects.get(name="home").num_todos, 7)
+
+    def test_repairs_wrong_counts(self):
+        """Without --check the drifted counts are recomputed"""
+        output = self.run_command()
+
+        self.assertIn('"home": stored 7, actual 1.', output)
+        self.assertIn("Fixed 1 tag count(s).", output)
+        self.assertEqual(Tag.objects.get(name="home").num_todos, 1)
+        self.assertIn("All tag counts are correct.", self.run_command("--check"))
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from core import bulk
+from core.models import Todo, TodoStatusCount
+
+
+class TodoStatusCountTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="stats", password="12345")
+
+    def counts(self):
+        return {
+            status: count
+            for status, count in TodoStatusCount.objects.filter(
+                user=self.user
+            ).values_list("status", "count")
+            if count
+        }
+
+    def test_new_users_are_seeded(self):
+        """Every status starts with a zero row"""
+        self.assertEqual(
+            TodoStatusCount.objects.filter(user=self.user, count=0).count(),
+            len(Todo.STATUS_CHOICES),
+        )
+
+    def test_save_and_delete(self):
+        """Creating, re-saving, changing status and deleting move the counts"""
+        todo = Todo.objects.create(title="One", user=self.user)
+        Todo.objects.create(title="Two", user=self.user)
+        todo.title = "Renamed"
+        todo.save()
+        self.assertEqual(self.counts(), {"OPEN": 2})
+
+        todo = Todo.objects.get(pk=todo.pk)
+        todo.status = "WORKING"
+        todo.save()
+        todo.status = "COMPLETED"
+        todo.save()
+        self.assertEqual(self.counts(), {"OPEN": 1, "COMPLETED": 1})
+
+        todo.delete()
+        self.assertEqual(self.counts(), {"OPEN": 1})
+
+    def test_unloaded_instance_save(self):
+        """A todo saved without being loaded first is read back once"""
+        todo = Todo.objects.create(title="One", user=self.user)
+        copy = Todo(
+            pk=todo.pk,
+            title="One",
+            status="CANCELLED",
+            user=self.user,
+            created_at=todo.created_at,
+        )
+        copy._state.adding = False
+        copy.save()
+        self.assertEqual(self.counts(), {"CANCELLED": 1})
+
+    def test_bulk_paths(self):
+        """Set-based status changes, deletes and the sweeper move the counts"""
+        todos = [Todo.objects.create(title=str(i), user=self.user) for i in range(4)]
+        bulk.set_status(
+            Todo.objects.filter(pk__in=[t.pk for t in todos[:2]]), "WORKING"
+        )
+        self.assertEqual(self.counts(), {"OPEN": 2, "WORKING": 2})
+
+        Todo.objects.filter(pk=todos[0].pk).update(
+            due_date=timezone.now() - timedelta(days=1)
+        )
+        call_command("mark_overdue", stdout=StringIO())
+        self.assertEqual(self.counts(), {"OPEN": 2, "WORKING": 1, "OVERDUE": 1})
+
+        bulk.delete_todos(Todo.objects.filter(status="OPEN"))
+        self.assertEqual(self.counts(), {"WORKING": 1, "OVERDUE": 1})
+
+    def test_deleting_user_removes_rows(self):
+        """The rollup rows go with their user"""
+        Todo.objects.create(title="One", user=self.user)
+        self.user.delete()
+        self.assertFalse(TodoStatusCount.objects.exists())
+
+
+class RebuildTodoStatsCommandTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="stats", password="12345")
+        Todo.objects.create(title="One", user=self.user).set_tags(["work"])
+        # Changes made behind the rollup's back
+        Todo.objects.update(status="WORKING")
+        TodoStatusCount.objects.filter(status="CANCELLED").delete()
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command("rebuild_todo_stats", *args, stdout=out)
+        return out.getvalue()
+
+    def test_check_reports_wrong_counts(self):
+        """--check lists drifted counts and fails without changing them"""
+        with self.assertRaises(CommandError):
+            self.run_command("--check")
+        self.assertEqual(
+            TodoStatusCount.objects.get(user=self.user, status="OPEN").count, 1
+        )
+
+    def test_rebuilds_from_todos(self):
+        """Without --check the rollup is rebuilt from core_todo"""
+        output = self.run_command()
+
+        self.assertIn(f"User {self.user.pk} OPEN: stored 1, actual 0.", output)
+        self.assertIn("All tag counts are correct.", self.run_command("--check"))
+        counts = dict(
+            TodoStatusCount.objects.filter(user=self.user).values_list(
+                "status", "count"
+            )
+        )
+        self.assertEqual(counts["WORKING"], 1)
+        self.assertEqual(counts["OPEN"], 0)
+        self.assertEqual(len(counts), len(Todo.STATUS_CHOICES))
@@ -1,12 +1,14 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TodoViewSet, todo_app_view
+from .views import BatchView, TagViewSet, TodoViewSet, todo_app_view
 from . import views
 
 router = DefaultRouter()
 router.register(r"todos", TodoViewSet)
+router.register(r"tags", TagViewSet, basename="tag")
 
 urlpatterns = [
+    path("api/batch/", BatchView.as_view(), name="batch"),
     path("api/", include(router.urls)),
     path("todo-app/", todo_app_view, name="todo_app"),
 ]
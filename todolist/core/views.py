@@ -1,24 +1,220 @@
+from django.conf import settings
 from django.shortcuts import render
 from django.views.generic import TemplateView
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from .models import Todo
-from .serializers import TodoSerializer
+from rest_framework.views import APIView
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from .autocomplete import suggest_tags
+from .batch import Batch
+from .bulk import merge_tags
+from .cache import cache_todo_list, etag_matches, todo_etag, todo_list_cache_key
+from .export import csv_stream, export_rows, ndjson_stream
+from .filters import TodoFilterBackend
+from .idempotency import idempotent
+from .models import Tag, Todo, TodoStatusCount
+from .readers import TodoReader
+from .search import search_todos
+from .serializers import (
+    BatchSerializer,
+    TagMergeSerializer,
+    TagSerializer,
+    TodoSerializer,
+)
+from .sync import collect_changes, decode_sync_token
 
 
 class TodoViewSet(viewsets.ModelViewSet):
     queryset = Todo.objects.all()
     serializer_class = TodoSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [TodoFilterBackend]
 
     def get_queryset(self):
         # Restrict queryset to only objects owned by the authenticated user
-        return Todo.objects.filter(user=self.request.user)
+        # and load tags up front so nested TagSerializer output does not
+        # issue one query per todo
+        queryset = Todo.objects.filter(user=self.request.user)
+        fields = self.requested_fields
+        if fields is None or "tags" in fields:
+            queryset = queryset.prefetch_related("tags")
+        if fields is not None:
+            # Read only the requested columns, plus the pagination key
+            columns = set(fields) - {"tags"}
+            if self.action == "list":
+                columns.add(self.paginator.get_ordering(self.request).lstrip("-"))
+            queryset = queryset.only(*columns)
+        if self.ranked:
+            queryset = search_todos(
+                queryset, self.request.query_params["q"], self.request.user
+            )
+        return queryset
+
+    @cached_property
+    def requested_fields(self):
+        # ?fields=id,title,... narrows list and detail responses; None means
+        # every field
+        param = self.request.query_params.get("fields")
+        if param is None or self.action not in ("list", "retrieve"):
+            return None
+        fields = [name.strip() for name in param.split(",") if name.strip()]
+        unknown = [name for name in fields if name not in TodoSerializer.Meta.fields]
+        if unknown or not fields:
+            choices = ", ".join(TodoSerializer.Meta.fields)
+            raise ValidationError(
+                {"fields": f"Must be a comma-separated list of: {choices}."}
+            )
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.requested_fields is not None:
+            kwargs.setdefault("fields", self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    @property
+    def ranked(self):
+        # ?q= on the list endpoint runs a full-text search ranked by bm25
+        return self.action == "list" and "q" in self.request.query_params
+
+    def not_modified(self, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    def list(self, request, *args, **kwargs):
+        # Answer conditional GETs before doing any work
+        etag = todo_etag(request)
+        if etag_matches(request, etag):
+            return self.not_modified(etag)
+
+        # Serve repeated list requests from the per-user versioned cache,
+        # skipping both the ORM and the serializer on a hit
+        cache_key = todo_list_cache_key(request)
+        data = cache.get(cache_key)
+        if data is not None:
+            return Response(data, headers={"ETag": etag})
+
+        response = self.read_list(request)
+        cache_todo_list(cache_key, response.data)
+        response["ETag"] = etag
+        return response
+
+    def read_list(self, request):
+        # Read path: values() rows turned straight into TodoSerializer's
+        # output by TodoReader, without model instances or field objects
+        reader = TodoReader(self.requested_fields)
+        if self.ranked:
+            extra = ("search_rank",)
+        else:
+            extra = (self.paginator.get_ordering(request).lstrip("-"),)
+        queryset = reader.queryset(self.filter_queryset(self.get_queryset()), *extra)
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(reader.serialize(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        etag = todo_etag(request)
+        if etag_matches(request, etag, wildcard=False):
+            return self.not_modified(etag)
+        if etag_matches(request, etag):
+            # "*" only matches a todo that exists (404s otherwise)
+            self.get_object()
+            return self.not_modified(etag)
+
+        response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        return response
+
+    def create(self, request, *args, **kwargs):
+        # Retries carrying the same Idempotency-Key replay the first response
+        return idempotent(request, super().create, *args, **kwargs)
 
     def perform_create(self, serializer):
         # Automatically associate the authenticated user with the Todo
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        return idempotent(request, self.bulk_create)
+
+    def bulk_create(self, request):
+        # Validate a list of todos and insert them in a single transaction;
+        # the cap keeps that one write transaction short
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=getattr(settings, "BULK_CREATE_MAX_TODOS", 1000),
+        )
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        # Delta sync: todos and tags changed after ?since=<token>, deletions
+        # as tombstones, and the token to send next time
+        since = request.query_params.get("since")
+        changes = collect_changes(
+            request.user, decode_sync_token(since) if since else None
+        )
+        return Response(
+            {
+                "todos": self.get_serializer(changes["todos"], many=True).data,
+                "tags": TagSerializer(changes["tags"], many=True).data,
+                "deleted": changes["deleted"],
+                "next": changes["next"],
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        # Dashboard counts come from the rollup rows (TodoStatusCount and
+        # Tag.num_todos), so the cost does not grow with the number of todos
+        by_status = dict.fromkeys((value for value, _ in Todo.STATUS_CHOICES), 0)
+        by_status.update(
+            TodoStatusCount.objects.filter(user=request.user).values_list(
+                "status", "count"
+            )
+        )
+        tags = (
+            Tag.objects.filter(user=request.user, num_todos__gt=0)
+            .order_by("-num_todos", "name")
+            .values_list("id", "name", "num_todos")
+        )
+        return Response(
+            {
+                "total": sum(by_status.values()),
+                "by_status": by_status,
+                "overdue": by_status["OVERDUE"],
+                "tags": [
+                    {"id": pk, "name": name, "count": count} for pk, name, count in tags
+                ],
+            }
+        )
+
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        # Stream every todo as NDJSON (default) or CSV via ?type=csv; the
+        # "format" parameter is reserved by DRF for renderer selection
+        export_type = request.query_params.get("type", "ndjson")
+        if export_type == "csv":
+            stream, content_type = csv_stream, "text/csv"
+        elif export_type == "ndjson":
+            stream, content_type = ndjson_stream, "application/x-ndjson"
+        else:
+            return Response(
+                {"type": "Must be one of: ndjson, csv."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        response = StreamingHttpResponse(
+            stream(export_rows(request.user)), content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="todos.{export_type}"'
+        return response
+
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop("partial", False)
         instance = self.get_object()
@@ -29,6 +225,88 @@ class TodoViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
+class TagViewSet(viewsets.ViewSet):
+    """
+    Tag autocomplete: ?prefix= returns the user's matching tags, most used
+    first, at most ?limit= of them.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 10
+    max_limit = 100
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return self.default_limit
+        return min(max(limit, 1), self.max_limit)
+
+    @action(detail=False, methods=["post"])
+    def merge(self, request):
+        # Fold the source tags into the target (or rename a single source)
+        # for every todo at once; see core.bulk.merge_tags
+        serializer = TagMergeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            target, changed = merge_tags(
+                request.user,
+                serializer.validated_data["sources"],
+                serializer.validated_data["target"],
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({"sources": exc.messages})
+        return Response(
+            {
+                "id": target.pk,
+                "name": target.name,
+                "count": target.num_todos,
+                "todos_changed": changed,
+            }
+        )
+
+    def list(self, request):
+        return Response(
+            suggest_tags(
+                request.user,
+                request.query_params.get("prefix", ""),
+                self.get_limit(request),
+            )
+        )
+
+
+class BatchView(APIView):
+    """
+    Applies an ordered list of todo and tag operations in one request.
+
+    Returns one result per operation. In ``atomic`` mode (the default) a
+    failure undoes the whole batch and answers 400; in ``savepoint`` mode
+    the other operations still apply and partial failure answers 207.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return idempotent(request, self.run)
+
+    def run(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        batch = Batch(
+            request,
+            serializer.validated_data["operations"],
+            serializer.validated_data["mode"],
+        )
+        ok, results = batch.run()
+        if ok:
+            code = status.HTTP_200_OK
+        elif batch.atomic:
+            code = status.HTTP_400_BAD_REQUEST
+        else:
+            code = status.HTTP_207_MULTI_STATUS
+        return Response({"results": results}, status=code)
+
+
 from django.shortcuts import render
 
 
@@ -38,11 +38,13 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    "rest_framework.authtoken",
     "core",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -83,6 +85,22 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Seconds a serialized todo list response stays in the cache. Only the
+# payloads live here; the per-user versions in their keys are kept in the
+# database (core.models.TodoVersion), so a per-process cache never serves
+# lists that another process has changed
+TODO_LIST_CACHE_TIMEOUT = 300
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -126,11 +144,58 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.BasicAuthentication",
+        "core.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
+        # Kept for compatibility; hashes the password on every request
+        "rest_framework.authentication.BasicAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson-backed JSON when installed, DRF's stdlib JSON otherwise
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.TodoCursorPagination",
+    "PAGE_SIZE": 50,
 }
+
+# Seconds a token -> user lookup is cached in process, and the cache size
+TOKEN_AUTH_CACHE_TTL = 300
+TOKEN_AUTH_CACHE_MAX_ENTRIES = 10000
+
+# Seconds a user's tag list is kept in process for autocomplete, and how
+# many users' lists are kept
+TAG_AUTOCOMPLETE_CACHE_TTL = 60
+TAG_AUTOCOMPLETE_CACHE_MAX_ENTRIES = 1000
+
+# Days deletions are kept for delta sync; older sync tokens must resync fully
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+# Seconds each delta sync reaches back before its token to pick up writes
+# that committed after an earlier sync; clients may see an item twice
+SYNC_SAFETY_WINDOW_SECONDS = 5
+
+# Hours a stored Idempotency-Key response is replayed for; purge older ones
+# with manage.py purge_idempotency_keys
+IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+# Most operations accepted in one request to /core/api/batch/
+BATCH_MAX_OPERATIONS = 100
+
+# Most todos accepted in one request to /core/api/todos/bulk/
+BULK_CREATE_MAX_TODOS = 1000
+
+# Response compression (core.middleware.CompressionMiddleware): buffered
+# responses smaller than this many bytes are sent as is, and the level used
+# for each encoding (br and zstd are offered only when installed)
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+
 TEST_RUNNER = "core.tests.test_runners.CustomTestRunner"